@@ -0,0 +1,3 @@
+# Shared capture, detection and classification pipeline used by
+# hand_gestures and the training tools. Import the submodules directly, so
+# tools that only need e.g. the quantized forest don't pull in MediaPipe.
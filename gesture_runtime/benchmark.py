@@ -0,0 +1,63 @@
+# Per stage timing of the shared pipeline over a camera or a recorded video.
+#
+#   python -m gesture_runtime.benchmark [source] [model] [frames]
+#
+# source is a camera index or a video file (default 0), model a .pkl or .npz
+# gesture model (default hand_gestures/gesture_model.pkl).
+import os
+import sys
+
+from .classifier import GestureClassifier
+from .features import FeatureExtractor
+from .frame_source import FrameSource
+from .landmarks import LandmarkProvider
+from .preprocessing import Preprocessor
+from .timing import StageTimer
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "..", "hand_gestures", "gesture_model.pkl")
+DEFAULT_FRAMES = 300
+
+DETECTION_WIDTH, DETECTION_HEIGHT = 640, 480
+
+
+def run(source, model_path, frames) -> StageTimer:
+    timer = StageTimer(history=frames)
+    preprocessor = Preprocessor(DETECTION_WIDTH, DETECTION_HEIGHT)
+    extractor = FeatureExtractor()
+    classifier = GestureClassifier.from_path(model_path)
+
+    with FrameSource(source) as frame_source, LandmarkProvider() as provider:
+        for _ in range(frames):
+            with timer.measure("read"):
+                frame = frame_source.read()
+            if frame is None:
+                break
+
+            with timer.measure("preprocess"):
+                rgb = preprocessor.to_detection(preprocessor.mirror(frame))
+
+            with timer.measure("landmarks"):
+                results = provider.process(rgb)
+
+            for hand_landmarks in results.multi_hand_landmarks or []:
+                with timer.measure("features"):
+                    features = extractor.extract(hand_landmarks)
+                with timer.measure("classify"):
+                    classifier.predict(features)
+
+    return timer
+
+
+def main(argv):
+    source = argv[0] if len(argv) > 0 else "0"
+    source = int(source) if source.isdigit() else source
+    model_path = argv[1] if len(argv) > 1 else DEFAULT_MODEL_PATH
+    frames = int(argv[2]) if len(argv) > 2 else DEFAULT_FRAMES
+
+    timer = run(source, model_path, frames)
+    timer.print_summary()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+# Compares the cost of getting a detection frame before and after camera
+# format negotiation.
+#
+#   python -m gesture_runtime.benchmark_preprocess [source] [frames]
+#
+# "default" opens the source in its default mode and runs the old path: flip
+# the full frame, resize it to the detection size, convert BGR to RGB.
+# "tuned" asks the camera for the detection size and runs the folded
+# mirror + RGB pass, skipping the resize when the frame already fits. File
+# sources can't be negotiated, so they show the folded pass on its own.
+import sys
+
+import cv2
+
+from .camera import CameraConfig
+from .frame_source import FrameSource
+from .preprocessing import Preprocessor
+from .timing import StageTimer
+
+DETECTION_WIDTH, DETECTION_HEIGHT = 640, 480
+DEFAULT_FRAMES = 300
+
+
+def run_default(source, frames, timer):
+    with FrameSource(source) as frame_source:
+        for _ in range(frames):
+            with timer.measure("default read"):
+                frame = frame_source.read()
+            if frame is None:
+                break
+            with timer.measure("default prep"):
+                frame = cv2.flip(frame, 1)
+                frame = cv2.resize(frame, (DETECTION_WIDTH, DETECTION_HEIGHT))
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return frame_source.width, frame_source.height
+
+
+def run_negotiated(source, frames, timer):
+    config = CameraConfig(DETECTION_WIDTH, DETECTION_HEIGHT)
+    preprocessor = Preprocessor(DETECTION_WIDTH, DETECTION_HEIGHT)
+    with FrameSource(source, config=config) as frame_source:
+        for _ in range(frames):
+            with timer.measure("tuned read"):
+                frame = frame_source.read()
+            if frame is None:
+                break
+            with timer.measure("tuned prep"):
+                preprocessor.to_detection(frame, mirror=True)
+        return frame_source.width, frame_source.height
+
+
+def main(argv):
+    source = argv[0] if len(argv) > 0 else "0"
+    source = int(source) if source.isdigit() else source
+    frames = int(argv[1]) if len(argv) > 1 else DEFAULT_FRAMES
+
+    timer = StageTimer(history=frames)
+    default_size = run_default(source, frames, timer)
+    negotiated_size = run_negotiated(source, frames, timer)
+
+    print(f"default capture {default_size[0]}x{default_size[1]}, "
+          f"negotiated capture {negotiated_size[0]}x{negotiated_size[1]}")
+    timer.print_summary()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+import logging
+import sys
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# V4L2 lets us pick the pixel format, other platforms use their default
+DEFAULT_BACKEND = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+
+
+class CameraConfig:
+    # Capture mode requested from the camera driver. Capturing at the
+    # detection size avoids decoding full size frames only to shrink them.
+    # YUYV is uncompressed and cheap to convert, MJPG needs a JPEG decode per
+    # frame but fits higher resolutions and frame rates through USB 2.
+
+    def __init__(self,
+                 width=640,
+                 height=480,
+                 fps=30,
+                 fourcc="YUYV",
+                 buffer_size=1,
+                 backend=DEFAULT_BACKEND):
+        if len(fourcc) != 4:
+            raise ValueError("fourcc must be a 4 character code")
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.backend = backend
+
+
+def fourcc_to_str(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def open_camera(device: int, config: CameraConfig) -> tuple[cv2.VideoCapture, dict]:
+    # Returns the capture and the mode the driver actually accepted
+    cap = cv2.VideoCapture(device, config.backend)
+    if not cap.isOpened() and config.backend != cv2.CAP_ANY:
+        logger.warning("Camera %s unavailable via backend %s, using default",
+                       device, config.backend)
+        cap = cv2.VideoCapture(device)
+
+    # Drivers apply the pixel format first, it limits the sizes on offer
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+    cap.set(cv2.CAP_PROP_FPS, config.fps)
+
+    # A short queue keeps frames fresh when processing falls behind
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+
+    negotiated = {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "fourcc": fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+
+    if (negotiated["width"], negotiated["height"], negotiated["fourcc"]) != (config.width, config.height, config.fourcc):
+        logger.warning("Camera %s negotiated %dx%d %s instead of %dx%d %s", device,
+                       negotiated["width"], negotiated["height"], negotiated["fourcc"],
+                       config.width, config.height, config.fourcc)
+    else:
+        logger.info("Camera %s capturing %dx%d %s at %.0f fps", device,
+                    negotiated["width"], negotiated["height"], negotiated["fourcc"], negotiated["fps"])
+
+    return cap, negotiated
@@ -0,0 +1,34 @@
+import joblib
+import numpy as np
+
+from .quantized_forest import QuantizedForest
+
+
+def read_model(path: str):
+    # Quantized forests exported by training.py are numpy archives, anything
+    # else is a pickled scikit-learn classifier
+    if path.endswith(".npz"):
+        return QuantizedForest.load(path)
+    return joblib.load(path)
+
+
+class GestureClassifier:
+    # Predicts a gesture label and its probability from one feature row. The
+    # model can be replaced at any time by assigning `model`.
+
+    def __init__(self, model):
+        self.model = model
+
+    @classmethod
+    def from_path(cls, path: str) -> 'GestureClassifier':
+        return cls(read_model(path))
+
+    @property
+    def classes(self):
+        return self.model.classes_
+
+    def predict(self, features: np.ndarray) -> tuple[str, float]:
+        model = self.model
+        probs = model.predict_proba(features)[0]
+        best = int(np.argmax(probs))
+        return model.classes_[best], float(probs[best])
@@ -0,0 +1,25 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 3
+
+# Column names used in hand_landmarks.csv
+FEATURE_NAMES = [f"{axis}{i}" for i in range(NUM_LANDMARKS)
+                 for axis in ['x', 'y', 'z']]
+
+
+class FeatureExtractor:
+    # Flattens MediaPipe hand landmarks into the classifier layout
+    # [x0, y0, z0, x1, ...]. The (1, 63) output row is reused between calls,
+    # so copy it if it has to outlive the next call.
+
+    def __init__(self):
+        self._features = np.zeros((1, NUM_FEATURES), dtype=np.float64)
+
+    def extract(self, hand_landmarks) -> np.ndarray:
+        row = self._features[0]
+        for i, lm in enumerate(hand_landmarks.landmark):
+            row[3 * i] = lm.x
+            row[3 * i + 1] = lm.y
+            row[3 * i + 2] = lm.z
+        return self._features
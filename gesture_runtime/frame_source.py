@@ -0,0 +1,107 @@
+import time
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+from .camera import CameraConfig, open_camera
+
+# Driver timestamps older than this (seconds) aren't trusted to be on the
+# monotonic clock, the read time is used instead
+MAX_DRIVER_TIMESTAMP_AGE = 1.0
+
+
+class FrameSource:
+    # Wraps cv2.VideoCapture for a camera index or a video file. Frames are
+    # decoded into the same buffer every read, so callers must finish with a
+    # frame (or copy it) before reading the next one.
+    #
+    # Cameras are opened with `config` when given, video files (and e.g.
+    # v4l2loopback devices fed from one) play back in their own format.
+    #
+    # Every read stamps `timestamp` with the capture time on the
+    # time.monotonic clock. V4L2 reports when the driver filled the buffer,
+    # which is as close to the glass as we can get; files and other backends
+    # fall back to the time the read returned.
+
+    def __init__(self,
+                 source: Union[int, str] = 0,
+                 loop: bool = False,
+                 config: Optional[CameraConfig] = None):
+        self.source = source
+        self.loop = loop
+        self.config = config
+        self.negotiated: Optional[dict] = None
+        self.cap: Optional[cv2.VideoCapture] = None
+        self._frame: Optional[np.ndarray] = None
+        self.timestamp: Optional[float] = None
+        self.timestamp_source: Optional[str] = None
+        # Position of the last frame read, restarts when a file loops
+        self.frame_index = -1
+
+    @property
+    def is_file(self) -> bool:
+        return isinstance(self.source, str)
+
+    def open(self) -> 'FrameSource':
+        if self.config is not None and not self.is_file:
+            self.cap, self.negotiated = open_camera(self.source, self.config)
+        else:
+            self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            raise IOError(f"Unable to open video source {self.source!r}")
+        return self
+
+    def close(self) -> None:
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def is_opened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    @property
+    def width(self) -> int:
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+
+    @property
+    def height(self) -> int:
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    @property
+    def fps(self) -> float:
+        return self.cap.get(cv2.CAP_PROP_FPS)
+
+    def read(self) -> Optional[np.ndarray]:
+        # Returns None when the source is exhausted (or the camera fails)
+        ret, frame = self.cap.read(self._frame)
+        if not ret and self.loop and self.is_file:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.frame_index = -1
+            ret, frame = self.cap.read(self._frame)
+        if not ret:
+            return None
+
+        self._stamp()
+        self.frame_index += 1
+        self._frame = frame
+        return frame
+
+    def _stamp(self) -> None:
+        now = time.monotonic()
+        if not self.is_file:
+            # V4L2 buffer timestamps are CLOCK_MONOTONIC, the same clock as
+            # time.monotonic on Linux. Other backends report 0 or stream time.
+            driver = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            if 0 <= now - driver < MAX_DRIVER_TIMESTAMP_AGE:
+                self.timestamp = driver
+                self.timestamp_source = "driver"
+                return
+        self.timestamp = now
+        self.timestamp_source = "monotonic"
@@ -0,0 +1,157 @@
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Detection sizes, cheapest first
+DEFAULT_LADDER = ((320, 240), (480, 360), (640, 480))
+
+# Frames the smoothed frame time of each size averages over
+GOVERNOR_WINDOW = 30
+
+# Fraction either side of the budget treated as "on target", so the governor
+# doesn't flap between two neighbouring sizes
+GOVERNOR_HYSTERESIS = 0.2
+
+# Frames to wait after a change before judging the new size
+GOVERNOR_SETTLE_FRAMES = 30
+
+# Below this mean landmark confidence a larger size is worth a tighter margin
+GOVERNOR_MIN_CONFIDENCE = 0.8
+
+# Frames spent at one size before trying the next size up again, whose last
+# measurement may be stale or missing
+GOVERNOR_PROBE_INTERVAL = 300
+
+# Each failed probe doubles the interval, up to this many times the base
+GOVERNOR_PROBE_BACKOFF = 8
+
+# A smaller size has to save at least this fraction of the frame time to be
+# worth the lost detail
+GOVERNOR_MIN_SAVING = 0.1
+
+
+class ResolutionGovernor:
+    # Steps the detection resolution through a ladder to hold a per frame time
+    # budget. The budget is the CPU share allowed per frame at the target rate,
+    # e.g. 30 fps at 0.5 share gives 16.7ms per frame.
+    #
+    # Detection cost hardly depends on the input size (MediaPipe resizes to
+    # its own model input), so every size keeps its own measured average
+    # instead of extrapolating from pixel counts. Stepping up uses the
+    # measured time of the larger size, sizes that were never measured or
+    # not for a while are probed by switching to them and measuring. Over
+    # budget it only steps down to a size that is unmeasured or measured
+    # cheaper, and steps straight back up from one that turns out not to
+    # be, so a slow box where every size costs the same stays at full size.
+    #
+    # Landmarks are normalised, so changing size never moves the coordinates.
+
+    def __init__(self,
+                 ladder=DEFAULT_LADDER,
+                 target_fps: float = 30.0,
+                 cpu_share: float = 1.0,
+                 window: int = GOVERNOR_WINDOW,
+                 hysteresis: float = GOVERNOR_HYSTERESIS,
+                 settle_frames: int = GOVERNOR_SETTLE_FRAMES,
+                 min_confidence: float = GOVERNOR_MIN_CONFIDENCE,
+                 probe_interval: int = GOVERNOR_PROBE_INTERVAL,
+                 start_level: Optional[int] = None):
+        if not ladder:
+            raise ValueError("ladder must have at least one size")
+        self.ladder = tuple(ladder)
+        self.budget = cpu_share / target_fps
+        self.alpha = 2.0 / (window + 1)
+        self.hysteresis = hysteresis
+        self.settle_frames = settle_frames
+        self.min_confidence = min_confidence
+        self.probe_interval = probe_interval
+        self.level = len(self.ladder) - 1 if start_level is None else start_level
+        self.level_times: list[Optional[float]] = [None] * len(self.ladder)
+        self.confidence: Optional[float] = None
+        self._settle = settle_frames
+        self._frames_at_level = 0
+        self._probe_interval = probe_interval
+        self._probing = False
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.ladder[self.level]
+
+    @property
+    def frame_time(self) -> Optional[float]:
+        return self.level_times[self.level]
+
+    def update(self, frame_time: float, confidence: Optional[float] = None) -> Optional[tuple[int, int]]:
+        # Feed one frame's processing time (seconds) and mean landmark
+        # confidence (None without hands). Returns the new size on a change.
+        level_time = self.level_times[self.level]
+        if level_time is None:
+            self.level_times[self.level] = frame_time
+        else:
+            self.level_times[self.level] = level_time + self.alpha * (frame_time - level_time)
+        self._frames_at_level += 1
+
+        if confidence is not None:
+            if self.confidence is None:
+                self.confidence = confidence
+            else:
+                self.confidence += self.alpha * (confidence - self.confidence)
+
+        if self._settle > 0:
+            self._settle -= 1
+            return None
+
+        upper = self.level_times[self.level + 1] if self.level < len(self.ladder) - 1 else None
+
+        # Nothing saved by being down here, go back up. The larger size's
+        # measured time stays, so the step down below doesn't come back.
+        if upper is not None and upper * (1 - GOVERNOR_MIN_SAVING) <= self.frame_time:
+            return self._step(1)
+
+        if self.level > 0:
+            lower = self.level_times[self.level - 1]
+            worth_lower = lower is None or lower < self.frame_time * (1 - GOVERNOR_MIN_SAVING)
+        else:
+            worth_lower = False
+
+        if self.frame_time > self.budget * (1 + self.hysteresis) and worth_lower:
+            if self._probing:
+                self._probe_interval = min(self._probe_interval * 2,
+                                           self.probe_interval * GOVERNOR_PROBE_BACKOFF)
+            return self._step(-1)
+        if self._probing:
+            self._probing = False
+            self._probe_interval = self.probe_interval
+
+        if self.level < len(self.ladder) - 1:
+            margin = 1 - self.hysteresis
+            if self.confidence is not None and self.confidence < self.min_confidence:
+                margin = 1.0
+
+            # Only step up to a size measured to fit the budget. An unknown
+            # one is probed, as is a stale one while this size fits. If it
+            # turns out slower the check above steps back down once it has
+            # settled.
+            if upper is not None and upper < self.budget * margin:
+                return self._step(1)
+            if upper is None or (self._frames_at_level >= self._probe_interval and
+                                 self.frame_time < self.budget * margin):
+                return self._step(1, probe=True)
+
+        return None
+
+    def _step(self, direction: int, probe: bool = False) -> tuple[int, int]:
+        frame_time = self.frame_time
+        self.level += direction
+        self._probing = probe
+        if probe:
+            # Measure the probed size afresh rather than blending into a
+            # time from before conditions changed
+            self.level_times[self.level] = None
+        self._settle = self.settle_frames
+        self._frames_at_level = 0
+
+        logger.info("Detection resolution %dx%d%s (frame time %.1fms, budget %.1fms)",
+                    *self.size, " probe" if probe else "", frame_time * 1000, self.budget * 1000)
+        return self.size
@@ -0,0 +1,48 @@
+import mediapipe as mp
+import numpy as np
+
+mp_hands = mp.solutions.hands
+mp_drawing = mp.solutions.drawing_utils
+
+
+class LandmarkProvider:
+    # MediaPipe hand landmark detection. Keeps the tracking state between
+    # frames, so use one provider per video stream.
+
+    def __init__(self,
+                 max_num_hands=2,
+                 min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5,
+                 static_image_mode=False):
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.static_image_mode = static_image_mode
+        self.hands = None
+
+    def open(self) -> 'LandmarkProvider':
+        self.hands = mp_hands.Hands(
+            static_image_mode=self.static_image_mode,
+            max_num_hands=self.max_num_hands,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+        return self
+
+    def close(self) -> None:
+        if self.hands:
+            self.hands.close()
+            self.hands = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def process(self, image_rgb: np.ndarray):
+        return self.hands.process(image_rgb)
+
+
+def draw_landmarks(frame, hand_landmarks) -> None:
+    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
@@ -0,0 +1,106 @@
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Histogram bucket upper edges in milliseconds, ten per decade from 1ms to
+# 10s. Anything slower lands in a final overflow bucket.
+BUCKET_EDGES_MS = tuple(round(10 ** (i / 10), 2) for i in range(41))
+
+# The same from 1us, for pipeline stages well under a millisecond
+FINE_BUCKET_EDGES_MS = tuple(round(10 ** (i / 10 - 3), 6) for i in range(71))
+
+
+class LatencyHistogram:
+    # Fixed bucket histogram, cheap enough to record every frame for days
+    # without growing. Percentiles resolve to a bucket edge (about 26% wide).
+
+    def __init__(self, edges=BUCKET_EDGES_MS):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.edges, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, percentile: float) -> float:
+        # Upper edge (ms) of the bucket holding the percentile, the overflow
+        # bucket reports the largest value seen
+        if self.count == 0:
+            return 0.0
+        rank = percentile / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.edges[i], self.max) if i < len(self.edges) else self.max
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class LatencyTracker:
+    # Named latency histograms measured from frame capture, e.g. "decision"
+    # (capture to HandState) and "dispatch" (capture to command sent)
+
+    def __init__(self, edges=BUCKET_EDGES_MS):
+        self.edges = edges
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram(self.edges)
+        histogram.add(seconds)
+
+    def since(self, name: str, captured_at: float, now: Optional[float] = None) -> float:
+        # Records and returns the time from `captured_at` (time.monotonic
+        # clock) to `now`
+        seconds = (time.monotonic() if now is None else now) - captured_at
+        self.add(name, seconds)
+        return seconds
+
+    def histogram(self, name: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(name)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        # Milliseconds per histogram
+        return {name: histogram.summary() for name, histogram in self._histograms.items()}
+
+    def reset(self) -> None:
+        self._histograms.clear()
+
+    def print_summary(self) -> None:
+        print(f"{'latency':<14}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+        for name, stats in self.summary().items():
+            print(f"{name:<14}{stats['count']:>8}{stats['mean']:>10.1f}{stats['p50']:>10.1f}"
+                  f"{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>10.1f}")
@@ -0,0 +1,82 @@
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class Preprocessor:
+    # Mirrors camera frames and converts them to the RGB detection size used
+    # by MediaPipe. Output buffers are reused between frames, and the resize
+    # is skipped when the camera already delivers the detection size.
+
+    def __init__(self, detection_width: Optional[int] = None, detection_height: Optional[int] = None):
+        self.detection_width = detection_width
+        self.detection_height = detection_height
+        self._mirrored: Optional[np.ndarray] = None
+        self._resized: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+
+    def mirror(self, frame: np.ndarray) -> np.ndarray:
+        # Selfie view, so moving a hand right moves it right on screen
+        self._mirrored = cv2.flip(frame, 1, dst=self._mirrored)
+        return self._mirrored
+
+    def to_detection(self, frame: np.ndarray, mirror: bool = False) -> np.ndarray:
+        h, w = frame.shape[:2]
+
+        # No detection size means detect at capture size
+        size = (self.detection_width or w, self.detection_height or h)
+        if size != (w, h):
+            self._resized = cv2.resize(frame, size, dst=self._resized)
+            frame = self._resized
+
+        if mirror:
+            self._rgb = mirror_bgr_to_rgb(frame, self._rgb)
+        else:
+            self._rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+
+def mirror_bgr_to_rgb(frame: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    # Reversing every row of bytes mirrors the pixels and swaps B and R in one
+    # pass: [B0 G0 R0 B1 G1 R1] becomes [R1 G1 B1 R0 G0 B0]
+    h, w, channels = frame.shape
+    if dst is None or dst.shape != frame.shape:
+        dst = np.empty_like(frame)
+    frame = np.ascontiguousarray(frame)
+    cv2.flip(frame.reshape(h, w * channels), 1,
+             dst=dst.reshape(h, w * channels))
+    return dst
+
+
+class Letterbox:
+    # Fits images into a fixed size canvas, keeping the aspect ratio and
+    # filling the remainder with black. The canvas is reused between calls.
+
+    def __init__(self, target_width: int, target_height: int):
+        self.target_width = target_width
+        self.target_height = target_height
+        self._canvas = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        h, w = image.shape[:2]
+        scale = min(self.target_width / w, self.target_height / h)
+        new_w = int(w * scale)
+        new_h = int(h * scale)
+
+        # Center the resized image
+        x_offset = (self.target_width - new_w) // 2
+        y_offset = (self.target_height - new_h) // 2
+
+        # Clear the borders, callers draw overlays onto the canvas
+        canvas = self._canvas
+        canvas[:y_offset] = 0
+        canvas[y_offset + new_h:] = 0
+        canvas[:, :x_offset] = 0
+        canvas[:, x_offset + new_w:] = 0
+
+        cv2.resize(image, (new_w, new_h),
+                   dst=canvas[y_offset:y_offset + new_h,
+                              x_offset:x_offset + new_w],
+                   interpolation=cv2.INTER_AREA)
+        return canvas
@@ -0,0 +1,150 @@
+import numpy as np
+
+FORMAT_VERSION = 1
+
+INT16_MAX = np.iinfo(np.int16).max
+
+# Quantised inputs are clipped to this range, leaving head room either side
+# of the thresholds so values outside the training range still compare right
+QUANT_RANGE = 30000
+
+
+class QuantizedForest:
+    # RandomForest flattened into int16 node arrays. Features and thresholds are
+    # quantised per feature, so every split is an int16 comparison, and the
+    # leaf class probabilities are stored as int16 fractions of INT16_MAX.
+    #
+    # All trees are walked together, one depth level per numpy step, so the
+    # cost per prediction is max_depth vectorised steps instead of a Python
+    # loop per tree.
+
+    def __init__(self, arrays: dict):
+        self.classes_ = arrays["classes"]
+        self.n_features_in_ = len(arrays["offset"])
+        self.offset = arrays["offset"]
+        self.scale = arrays["scale"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.leaf = arrays["leaf"]
+        self.values = arrays["values"]
+        self.roots = arrays["roots"]
+        self.max_depth = int(arrays["max_depth"])
+        self.n_estimators = len(self.roots)
+
+    @classmethod
+    def from_forest(cls, forest) -> 'QuantizedForest':
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        n_features = forest.n_features_in_
+
+        # Per feature quantisation range from the split thresholds, inputs
+        # beyond the outermost thresholds all take the same branches anyway
+        low = np.full(n_features, np.inf)
+        high = np.full(n_features, -np.inf)
+        for tree in trees:
+            split = tree.children_left >= 0
+            np.minimum.at(low, tree.feature[split], tree.threshold[split])
+            np.maximum.at(high, tree.feature[split], tree.threshold[split])
+
+        unused = ~np.isfinite(low)
+        low[unused], high[unused] = 0.0, 0.0
+        span = np.maximum(high - low, 1e-6)
+        # Thresholds are quantised with exactly the float32 arithmetic used on
+        # the inputs, so x <= threshold always implies q(x) <= q(threshold)
+        offset = ((low + high) / 2).astype(np.float32)
+        scale = ((2 * QUANT_RANGE) / span / 1.1).astype(np.float32)
+
+        features, thresholds, lefts, rights, leaves, values, roots = [], [], [], [], [], [], []
+        node_base = 0
+        leaf_base = 0
+        for tree in trees:
+            is_leaf = tree.children_left < 0
+            node_ids = np.arange(tree.node_count)
+
+            feature = np.where(is_leaf, 0, tree.feature)
+            threshold = np.where(is_leaf, 0, np.floor(
+                (tree.threshold.astype(np.float32) - offset[feature]) * scale[feature]))
+
+            # Leaves point at themselves so extra traversal steps are no-ops
+            left = np.where(is_leaf, node_ids, tree.children_left) + node_base
+            right = np.where(is_leaf, node_ids, tree.children_right) + node_base
+
+            leaf = np.zeros(tree.node_count, dtype=np.int64)
+            leaf[is_leaf] = np.arange(is_leaf.sum()) + leaf_base
+
+            proba = tree.value[is_leaf, 0, :]
+            proba = proba / proba.sum(axis=1, keepdims=True)
+
+            features.append(feature)
+            thresholds.append(np.clip(threshold, -INT16_MAX, INT16_MAX))
+            lefts.append(left)
+            rights.append(right)
+            leaves.append(leaf)
+            values.append(np.round(proba * INT16_MAX))
+            roots.append(node_base)
+
+            node_base += tree.node_count
+            leaf_base += int(is_leaf.sum())
+
+        return cls({
+            "classes": np.asarray(forest.classes_),
+            "offset": offset,
+            "scale": scale,
+            "feature": np.concatenate(features).astype(np.uint8 if n_features <= 256 else np.uint16),
+            "threshold": np.concatenate(thresholds).astype(np.int16),
+            "left": np.concatenate(lefts).astype(np.int32),
+            "right": np.concatenate(rights).astype(np.int32),
+            "leaf": np.concatenate(leaves).astype(np.int32),
+            "values": np.concatenate(values).astype(np.int16),
+            "roots": np.asarray(roots, dtype=np.int32),
+            "max_depth": max(estimator.tree_.max_depth for estimator in forest.estimators_),
+        })
+
+    @classmethod
+    def load(cls, path: str) -> 'QuantizedForest':
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(
+                    f"unsupported quantized model version {int(data['format_version'])}")
+            return cls({key: data[key] for key in data.files})
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            format_version=FORMAT_VERSION,
+            classes=self.classes_.astype(str),
+            offset=self.offset,
+            scale=self.scale,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            leaf=self.leaf,
+            values=self.values,
+            roots=self.roots,
+            max_depth=self.max_depth,
+        )
+
+    def quantize(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        q = np.floor((X - self.offset) * self.scale)
+        return np.clip(q, -QUANT_RANGE, QUANT_RANGE).astype(np.int16)
+
+    def predict_proba(self, X) -> np.ndarray:
+        q = self.quantize(X)
+        if q.ndim == 1:
+            q = q[np.newaxis, :]
+
+        # (samples, trees) node index, every tree advances one level per step
+        nodes = np.broadcast_to(self.roots, (len(q), self.n_estimators))
+        rows = np.arange(len(q))[:, np.newaxis]
+        for _ in range(self.max_depth):
+            go_left = q[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        votes = self.values[self.leaf[nodes]].sum(axis=1, dtype=np.int32)
+        return votes / float(INT16_MAX * self.n_estimators)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
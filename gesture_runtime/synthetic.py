@@ -0,0 +1,126 @@
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .features import NUM_FEATURES, NUM_LANDMARKS
+
+# Augmentation defaults
+ROTATION_DEGREES = 15.0
+SCALE_RANGE = (0.85, 1.15)
+TRANSLATION = 0.1
+NOISE = 0.003
+
+# Fraction of each class' covariance used to perturb the hand shape
+SHAPE_JITTER = 0.1
+
+# Normalised x and y are scaled by different frame sides, rotate in a 4:3
+# pixel space so hands don't shear
+ASPECT_RATIO = 640 / 480
+
+
+class SyntheticLandmarks:
+    # Generates realistic 21x3 hand samples from the per class landmark
+    # distributions of a dataset. Each sample starts from a real sample of
+    # its class, gets a shape perturbation drawn from the class covariance,
+    # then a random in-plane rotation about the wrist, scale, translation and
+    # per landmark noise. Everything is batched in numpy.
+
+    def __init__(self,
+                 X: np.ndarray,
+                 y: np.ndarray,
+                 rotation: float = ROTATION_DEGREES,
+                 scale=SCALE_RANGE,
+                 translation: float = TRANSLATION,
+                 noise: float = NOISE,
+                 shape_jitter: float = SHAPE_JITTER,
+                 seed: Optional[int] = None):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, NUM_FEATURES)
+        y = np.asarray(y)
+        if len(X) != len(y):
+            raise ValueError("X and y must have the same number of samples")
+
+        self.rotation = np.radians(rotation)
+        self.scale = scale
+        self.translation = translation
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+        self.classes = np.unique(y)
+        self._samples = {}
+        self._shape_factors = {}
+        for label in self.classes:
+            samples = X[y == label]
+            self._samples[label] = samples.reshape(-1, NUM_LANDMARKS, 3)
+
+            # Covariance of the wrist relative shape, the Cholesky factor
+            # turns standard normal draws into correlated shape changes
+            relative = samples.reshape(-1, NUM_LANDMARKS, 3) - \
+                samples.reshape(-1, NUM_LANDMARKS, 3)[:, :1, :]
+            relative = relative.reshape(-1, NUM_FEATURES)
+            if len(relative) > 1:
+                cov = np.cov(relative, rowvar=False) * shape_jitter
+            else:
+                cov = np.zeros((NUM_FEATURES, NUM_FEATURES))
+            cov += np.eye(NUM_FEATURES) * 1e-10
+            self._shape_factors[label] = np.linalg.cholesky(cov)
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> 'SyntheticLandmarks':
+        # hand_landmarks.csv layout: 63 feature columns and a label column
+        df = pd.read_csv(path)
+        X = df.drop("label", axis=1).to_numpy(dtype=np.float64)
+        return cls(X, df["label"].to_numpy(), **kwargs)
+
+    def generate_class(self, label, count: int) -> np.ndarray:
+        # Returns (count, 21, 3) landmarks for one class
+        rng = self.rng
+        seeds = self._samples[label]
+        hands = seeds[rng.integers(0, len(seeds), size=count)].copy()
+
+        wrist = hands[:, :1, :].copy()
+        relative = hands - wrist
+
+        # Shape perturbation along the class covariance
+        shape = rng.standard_normal((count, NUM_FEATURES)) @ self._shape_factors[label].T
+        relative += shape.reshape(count, NUM_LANDMARKS, 3)
+
+        # Rotate about the wrist in square pixel space
+        angle = rng.uniform(-self.rotation, self.rotation, size=(count, 1))
+        cos, sin = np.cos(angle), np.sin(angle)
+        x = relative[:, :, 0] * ASPECT_RATIO
+        y = relative[:, :, 1]
+        relative[:, :, 0] = (cos * x - sin * y) / ASPECT_RATIO
+        relative[:, :, 1] = sin * x + cos * y
+
+        relative *= rng.uniform(*self.scale, size=(count, 1, 1))
+
+        wrist[:, :, :2] += rng.uniform(-self.translation, self.translation, size=(count, 1, 2))
+        hands = wrist + relative
+        hands += rng.normal(0.0, self.noise, size=hands.shape)
+        return hands
+
+    def generate(self, count: int, labels=None) -> tuple[np.ndarray, np.ndarray]:
+        # Returns (count, 63) features and their labels, balanced across
+        # `labels` (default all classes) and shuffled
+        labels = self.classes if labels is None else np.asarray(labels)
+        per_class = np.full(len(labels), count // len(labels))
+        per_class[:count % len(labels)] += 1
+
+        X = np.empty((count, NUM_FEATURES), dtype=np.float64)
+        y = np.empty(count, dtype=labels.dtype)
+        start = 0
+        for label, n in zip(labels, per_class):
+            X[start:start + n] = self.generate_class(label, n).reshape(n, NUM_FEATURES)
+            y[start:start + n] = label
+            start += n
+
+        order = self.rng.permutation(count)
+        return X[order], y[order]
+
+    def batches(self, total: int, batch_size: int = 10000) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        remaining = total
+        while remaining > 0:
+            count = min(batch_size, remaining)
+            yield self.generate(count)
+            remaining -= count
@@ -0,0 +1,62 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Samples kept per stage, enough for a stable p99 without growing forever
+STAGE_HISTORY = 1000
+
+
+class StageTimer:
+    # Records the duration of named pipeline stages over a rolling window
+
+    def __init__(self, history: int = STAGE_HISTORY):
+        self.history = history
+        self._samples: dict[str, deque] = {}
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.history)
+        samples.append(seconds)
+
+    def stages(self) -> list[str]:
+        return list(self._samples)
+
+    def percentile(self, stage: str, percentile: float) -> float:
+        samples = self._samples.get(stage)
+        if not samples:
+            return 0.0
+        return float(np.percentile(samples, percentile))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        # Milliseconds per stage
+        result = {}
+        for stage, samples in self._samples.items():
+            values = np.asarray(samples) * 1000
+            result[stage] = {
+                "count": len(values),
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p99": float(np.percentile(values, 99)),
+                "max": float(values.max()),
+            }
+        return result
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def print_summary(self) -> None:
+        print(f"{'stage':<14}{'count':>8}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}  (ms)")
+        for stage, stats in self.summary().items():
+            print(f"{stage:<14}{stats['count']:>8}{stats['mean']:>10.3f}{stats['p50']:>10.3f}"
+                  f"{stats['p99']:>10.3f}{stats['max']:>10.3f}")
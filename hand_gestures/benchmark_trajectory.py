@@ -0,0 +1,143 @@
+# Replays a synthetic landmark stream through TrajectoryTracker.
+#
+# The cost sweep runs a range of window lengths, each allowed to fill, and
+# per frame cost should stay flat as the window grows. Windows much longer
+# than a swipe take in the drift between swipes and fail the straightness
+# check, so the sweep doesn't report detection.
+#
+# The detection check runs the tracker as HandProcessor configures it and
+# fails on missed or wrong swipes, or a mean latency over the limit.
+import random
+import sys
+import time
+from gesture import SwipeGesture
+from trajectory import TRAJECTORY_WINDOW, TrajectoryTracker
+
+FPS = 30
+REPLAY_FRAMES = 30000
+SWIPE_EVERY = 90
+SWIPE_FRAMES = 8
+SWIPE_DISTANCE = 0.4
+JITTER = 0.004
+
+WINDOWS = (8, 16, 32, 64, 128, 256)
+
+# Let every window fill instead of capping it at the tracker's default swipe
+# duration, plus a frame of slack so timestamp rounding never trims it
+WINDOW_DURATION_MARGIN = 1
+
+# Frames from swipe onset to detection, the swipe itself takes SWIPE_FRAMES
+MAX_MEAN_LATENCY_FRAMES = 8
+
+SWIPE_STEPS = {
+    SwipeGesture.LEFT: (-1.0, 0.0),
+    SwipeGesture.RIGHT: (1.0, 0.0),
+    SwipeGesture.UP: (0.0, -1.0),
+    SwipeGesture.DOWN: (0.0, 1.0),
+}
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.z = 0.0
+
+
+def swipe_path(direction):
+    # Start and end position of a swipe, centred so it stays inside the frame
+    sx, sy = SWIPE_STEPS[direction]
+    start = (0.5 - sx * SWIPE_DISTANCE / 2, 0.5 - sy * SWIPE_DISTANCE / 2)
+    end = (0.5 + sx * SWIPE_DISTANCE / 2, 0.5 + sy * SWIPE_DISTANCE / 2)
+    return start, end
+
+
+def build_replay():
+    # Returns [(timestamp, landmarks)] and the expected swipe per onset frame.
+    # Between swipes the hand drifts slowly back to the next start position.
+    rng = random.Random(42)
+    directions = list(SWIPE_STEPS)
+    frames = []
+    expected = {}
+
+    for i in range(REPLAY_FRAMES):
+        n = i // SWIPE_EVERY
+        phase = i % SWIPE_EVERY
+        start, end = swipe_path(directions[n % len(directions)])
+
+        if phase == 0:
+            expected[i] = directions[n % len(directions)]
+
+        if phase <= SWIPE_FRAMES:
+            f = phase / SWIPE_FRAMES
+            x = start[0] + (end[0] - start[0]) * f
+            y = start[1] + (end[1] - start[1]) * f
+        else:
+            next_start, _ = swipe_path(directions[(n + 1) % len(directions)])
+            f = (phase - SWIPE_FRAMES) / (SWIPE_EVERY - SWIPE_FRAMES)
+            x = end[0] + (next_start[0] - end[0]) * f
+            y = end[1] + (next_start[1] - end[1]) * f
+
+        landmarks = [Landmark(x + rng.uniform(-JITTER, JITTER),
+                              y + rng.uniform(-JITTER, JITTER)) for _ in range(21)]
+        frames.append((i / FPS, landmarks))
+
+    return frames, expected
+
+
+def run(tracker, frames, expected):
+    timings = []
+    detected = []
+    onset = None
+
+    for i, (timestamp, landmarks) in enumerate(frames):
+        if i in expected:
+            onset = (i, expected[i])
+        start = time.perf_counter()
+        swipe = tracker.update(landmarks, timestamp)
+        timings.append(time.perf_counter() - start)
+        if swipe is not None:
+            detected.append((i, swipe, onset))
+
+    correct = [d for d in detected if d[2] is not None and d[1] == d[2][1]]
+    latency = [(i - onset[0]) for i, _, onset in correct]
+
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    return mean, p99, len(expected), len(correct), len(detected) - len(correct), latency
+
+
+def main():
+    frames, expected = build_replay()
+
+    print("Cost by window:")
+    print(f"{'window':>8}{'mean (us)':>12}{'p99 (us)':>12}")
+    for window in WINDOWS:
+        tracker = TrajectoryTracker(window, max_duration=(window + WINDOW_DURATION_MARGIN) / FPS)
+        mean, p99, *_ = run(tracker, frames, expected)
+        print(f"{window:>8}{mean * 1e6:>12.2f}{p99 * 1e6:>12.2f}")
+
+    print()
+    print(f"Detection at the default window ({TRAJECTORY_WINDOW} frames):")
+    _, _, swipes, hits, false, latency = run(TrajectoryTracker(), frames, expected)
+    avg_latency = sum(latency) / len(latency) if latency else 0.0
+    print(f"{'swipes':>8}{'hits':>6}{'false':>7}{'latency (frames)':>18}")
+    print(f"{swipes:>8}{hits:>6}{false:>7}{avg_latency:>18.1f}")
+
+    problems = []
+    if hits < swipes:
+        problems.append(f"{swipes - hits} of {swipes} swipes missed")
+    if false:
+        problems.append(f"{false} false swipes")
+    if avg_latency > MAX_MEAN_LATENCY_FRAMES:
+        problems.append(f"mean latency {avg_latency:.1f} frames over {MAX_MEAN_LATENCY_FRAMES}")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import Optional
+from gesture import HandGesture, HandsGesture, SwipeGesture
+from gesture_event import GestureEvent
+import runtime_path  # noqa: F401
+from gesture_runtime.latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Stand-in consumers for the gesture event bus. None of them talk to real
+# hardware or the network yet, they take about as long as the real thing
+# would and record the most recent events they were sent.
+
+# Codes from the buttonCodes table in remote_decoder.ino for the gestures
+# that map to a remote button. Horizontal swipes step through content and
+# vertical ones change the volume.
+IR_CODES = {
+    SwipeGesture.LEFT: 0x1B0E4F,          # Return
+    SwipeGesture.RIGHT: 0x3A0C5F,         # Next
+    SwipeGesture.UP: 0xB0F4F,             # Volume Up
+    SwipeGesture.DOWN: 0x8B074F,          # Volume Down
+    HandGesture.OK: 0xD002FF,             # OK
+    HandGesture.FIST: 0x30FCF,            # Mute
+    HandGesture.THUMBS_UP: 0xB0F4F,       # Volume Up
+    HandGesture.THUMBS_DOWN: 0x8B074F,    # Volume Down
+    HandsGesture.WAKE: 0xAB054F,          # Power
+}
+
+# 24 pulse distance bits at 560us marks and 560/1690us spaces take about 40ms
+IR_SEND_TIME = 0.04
+
+# Home automation webhook round trip, seconds
+WEBHOOK_LATENCY = (0.05, 0.3)
+
+# Events each consumer remembers, None keeps everything (for short test runs)
+CONSUMER_HISTORY = 100
+
+
+class LoggingConsumer:
+    # Logs each gesture. Until something real acts on gestures it can stand
+    # in for dispatch: with `dispatch` set it marks each event dispatched and
+    # records capture to dispatch latency. Events are shared between
+    # subscribers, so at most one of them should mark them.
+
+    def __init__(self, dispatch: bool = False, history: Optional[int] = CONSUMER_HISTORY):
+        self.dispatch = dispatch
+        self.dispatch_latency = LatencyHistogram()
+        self.events: deque[GestureEvent] = deque(maxlen=history)
+
+    async def __call__(self, event: GestureEvent) -> None:
+        self.events.append(event)
+        logger.info("Gesture %s", event)
+        if self.dispatch:
+            self.dispatch_latency.add(event.mark_dispatched())
+
+
+class IrDispatchConsumer:
+    # Sends the IR code mapped to a gesture, one frame at a time like a real
+    # IR LED. Gestures without a code are ignored.
+
+    def __init__(self,
+                 codes: Optional[dict] = None,
+                 send_time: float = IR_SEND_TIME,
+                 history: Optional[int] = CONSUMER_HISTORY):
+        self.codes = IR_CODES if codes is None else codes
+        self.send_time = send_time
+        self.sent: deque[tuple[int, GestureEvent]] = deque(maxlen=history)
+
+    async def __call__(self, event: GestureEvent) -> None:
+        code = self.codes.get(event.gesture)
+        if code is None:
+            return
+        await asyncio.sleep(self.send_time)
+        self.sent.append((code, event))
+        logger.debug("IR 0x%X for %s", code, event)
+
+
+class WebhookConsumer:
+    # Posts each gesture to a home automation hub, with a network round trip
+    # that is usually short and occasionally very slow
+
+    def __init__(self,
+                 latency=WEBHOOK_LATENCY,
+                 stall_chance: float = 0.05,
+                 stall_time: float = 2.0,
+                 seed: Optional[int] = None,
+                 history: Optional[int] = CONSUMER_HISTORY):
+        self.latency = latency
+        self.stall_chance = stall_chance
+        self.stall_time = stall_time
+        self.rng = random.Random(seed)
+        self.posted: deque[GestureEvent] = deque(maxlen=history)
+
+    async def __call__(self, event: GestureEvent) -> None:
+        if self.rng.random() < self.stall_chance:
+            delay = self.stall_time
+        else:
+            delay = self.rng.uniform(*self.latency)
+        await asyncio.sleep(delay)
+        self.posted.append(event)
@@ -0,0 +1,227 @@
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable, Optional, Union
+from gesture_event import GestureEvent
+import runtime_path  # noqa: F401
+from gesture_runtime.latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Events a subscriber can fall behind by before its overflow policy kicks in
+DEFAULT_QUEUE_SIZE = 8
+
+# Seconds to wait for subscribers to finish their current event on stop
+STOP_TIMEOUT = 2.0
+
+Handler = Callable[[GestureEvent], Union[Awaitable[None], None]]
+
+
+class OverflowPolicy(Enum):
+    # Full queue: discard the oldest pending event
+    DROP_OLDEST = "drop_oldest"
+    # Keep only the newest pending event per hand and gesture kind (hand
+    # pose, swipe or two handed), for consumers that only care about the
+    # latest state. Full queues still drop the oldest.
+    COALESCE = "coalesce"
+
+
+class Subscription:
+    # One consumer's bounded queue and the task draining it. Only touched
+    # from the bus loop, apart from the counters read by metrics().
+
+    def __init__(self,
+                 name: str,
+                 handler: Handler,
+                 maxsize: int = DEFAULT_QUEUE_SIZE,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if not isinstance(policy, OverflowPolicy):
+            raise TypeError("policy must be an instance of OverflowPolicy")
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.policy = policy
+        self._is_async = inspect.iscoroutinefunction(handler) or \
+            inspect.iscoroutinefunction(getattr(handler, "__call__", None))
+
+        # (published_at, event), oldest first
+        self._pending: deque[tuple[float, GestureEvent]] = deque()
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+
+        # Publish to handler start, and capture to handler done
+        self.lag = LatencyHistogram()
+        self.latency = LatencyHistogram()
+
+    @staticmethod
+    def _key(event: GestureEvent):
+        return event.side, type(event.gesture)
+
+    def offer(self, event: GestureEvent, published_at: float) -> None:
+        self.received += 1
+
+        if self.policy == OverflowPolicy.COALESCE:
+            key = self._key(event)
+            for i, (_, pending) in enumerate(self._pending):
+                if self._key(pending) == key:
+                    # Keep the queue position, lag counts from the first
+                    self._pending[i] = (self._pending[i][0], event)
+                    self.coalesced += 1
+                    return
+
+        if len(self._pending) >= self.maxsize:
+            self._pending.popleft()
+            self.dropped += 1
+
+        self._pending.append((published_at, event))
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._ready.set()
+
+    def start(self) -> None:
+        self._ready = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            published_at, event = self._pending.popleft()
+            self.lag.add(time.monotonic() - published_at)
+            try:
+                if self._is_async:
+                    await self.handler(event)
+                else:
+                    # Blocking consumers get a worker thread, not the bus loop
+                    await loop.run_in_executor(None, self.handler, event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Subscriber %s failed on %s", self.name, event)
+                continue
+
+            self.latency.add(time.monotonic() - event.captured_at)
+            self.delivered += 1
+
+    def metrics(self) -> dict:
+        # Latencies in ms
+        return {
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "lag": self.lag.summary(),
+            "latency": self.latency.summary(),
+        }
+
+
+class GestureEventBus:
+    # Fans gesture events out to subscribers on an asyncio loop in a
+    # background thread. publish() only hands the events to the loop, so a
+    # slow or stuck consumer never holds up the frame loop, it just falls
+    # behind in its own bounded queue.
+    #
+    # Events are expected to be edge triggered already, i.e. the output of
+    # GestureEventDetector rather than the per frame HandState.
+
+    def __init__(self):
+        self._subscriptions: dict[str, Subscription] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.published = 0
+
+    def subscribe(self,
+                  name: str,
+                  handler: Handler,
+                  maxsize: int = DEFAULT_QUEUE_SIZE,
+                  policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST) -> Subscription:
+        # `handler` is called with each GestureEvent, coroutine functions run
+        # on the bus loop and plain functions on a worker thread
+        if name in self._subscriptions:
+            raise ValueError(f"Subscriber {name!r} already exists")
+        subscription = Subscription(name, handler, maxsize, policy)
+        if self._loop is None:
+            self._subscriptions[name] = subscription
+        else:
+            # Register on the loop so fan out never sees it unstarted
+            self._loop.call_soon_threadsafe(self._add, subscription)
+        return subscription
+
+    def _add(self, subscription: Subscription) -> None:
+        subscription.start()
+        self._subscriptions[subscription.name] = subscription
+
+    def start(self) -> 'GestureEventBus':
+        if self._thread is not None:
+            return self
+
+        self._loop = asyncio.new_event_loop()
+        for subscription in self._subscriptions.values():
+            self._loop.call_soon(subscription.start)
+
+        self._thread = threading.Thread(
+            target=self._run, name="GestureEventBus", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _shutdown(self) -> None:
+        tasks = [s._task for s in self._subscriptions.values() if s._task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop.stop()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        self._thread.join(STOP_TIMEOUT)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._thread = None
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def publish(self, events: list[GestureEvent]) -> None:
+        # Safe to call from any thread, never blocks on subscribers
+        if not events or self._loop is None:
+            return
+        self.published += len(events)
+        self._loop.call_soon_threadsafe(self._fan_out, events, time.monotonic())
+
+    def _fan_out(self, events: list[GestureEvent], published_at: float) -> None:
+        for event in events:
+            for subscription in self._subscriptions.values():
+                subscription.offer(event, published_at)
+
+    def metrics(self) -> dict:
+        return {name: subscription.metrics() for name, subscription in list(self._subscriptions.items())}
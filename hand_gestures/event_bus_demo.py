@@ -0,0 +1,106 @@
+# Drives the gesture event bus with synthetic gesture transitions at camera
+# frame rate and the fake consumers, including one that never returns, then
+# reports how long publishing took on the frame loop and each subscriber's
+# lag, drops and latency.
+#
+#   python event_bus_demo.py [seconds]
+import asyncio
+import logging
+import random
+import sys
+import time
+
+import runtime_path  # noqa: F401
+
+from gesture_runtime.timing import StageTimer
+from consumers import IrDispatchConsumer, LoggingConsumer, WebhookConsumer
+from event_bus import GestureEventBus, OverflowPolicy
+from gesture import HandGesture, HandsGesture, SwipeGesture
+from gesture_event import GestureEvent
+from hand_side import HandSide
+
+# Config
+DEFAULT_SECONDS = 10
+FRAME_RATE = 30
+
+# Chance of a gesture transition on any frame, real use is far lower
+EVENT_CHANCE = 0.3
+
+# Publishing must never cost the frame loop more than this
+PUBLISH_BUDGET_MS = 1.0
+
+GESTURES = [HandGesture.FIST, HandGesture.OK, HandGesture.THUMBS_UP,
+            HandGesture.THUMBS_DOWN, SwipeGesture.LEFT, SwipeGesture.RIGHT,
+            SwipeGesture.UP, SwipeGesture.DOWN]
+
+
+async def stuck_consumer(event: GestureEvent) -> None:
+    # Never finishes, its queue fills and drops while the others carry on
+    await asyncio.Event().wait()
+
+
+def random_events(rng: random.Random, captured_at: float) -> list[GestureEvent]:
+    if rng.random() >= EVENT_CHANCE:
+        return []
+    now = time.monotonic()
+    if rng.random() < 0.05:
+        return [GestureEvent(HandsGesture.WAKE, None, captured_at, now)]
+    side = rng.choice([HandSide.LEFT, HandSide.RIGHT])
+    return [GestureEvent(rng.choice(GESTURES), side, captured_at, now)]
+
+
+def main(argv):
+    seconds = float(argv[0]) if argv else DEFAULT_SECONDS
+    rng = random.Random(42)
+    timer = StageTimer(history=int(seconds * FRAME_RATE))
+
+    logging_consumer = LoggingConsumer()
+    # Keep everything, the totals are reported at the end
+    ir_consumer = IrDispatchConsumer(history=None)
+    webhook_consumer = WebhookConsumer(seed=42, history=None)
+
+    bus = GestureEventBus()
+    bus.subscribe("log", logging_consumer)
+    bus.subscribe("ir", ir_consumer, maxsize=4)
+    bus.subscribe("webhook", webhook_consumer, maxsize=4, policy=OverflowPolicy.COALESCE)
+    bus.subscribe("stuck", stuck_consumer, maxsize=2)
+
+    interval = 1.0 / FRAME_RATE
+    with bus:
+        start = time.monotonic()
+        for frame in range(int(seconds * FRAME_RATE)):
+            captured_at = start + frame * interval
+            now = time.monotonic()
+            if now < captured_at:
+                time.sleep(captured_at - now)
+
+            events = random_events(rng, captured_at)
+            with timer.measure("publish"):
+                bus.publish(events)
+
+        # Let the consumers catch up with the last events
+        time.sleep(1.0)
+        metrics = bus.metrics()
+
+    print(f"Published {bus.published} events over {seconds:.0f}s")
+    timer.print_summary()
+    print()
+    print(f"{'subscriber':<12}{'recv':>6}{'done':>6}{'drop':>6}{'merge':>6}{'depth':>7}"
+          f"{'lag p50':>9}{'lag p99':>9}{'lat p50':>9}{'lat p99':>9}  (ms)")
+    for name, stats in metrics.items():
+        print(f"{name:<12}{stats['received']:>6}{stats['delivered']:>6}{stats['dropped']:>6}"
+              f"{stats['coalesced']:>6}{stats['max_depth']:>7}"
+              f"{stats['lag']['p50']:>9.1f}{stats['lag']['p99']:>9.1f}"
+              f"{stats['latency']['p50']:>9.1f}{stats['latency']['p99']:>9.1f}")
+    print(f"IR codes sent: {len(ir_consumer.sent)}, webhooks posted: {len(webhook_consumer.posted)}")
+
+    publish_p99 = timer.percentile("publish", 99) * 1000
+    if publish_p99 > PUBLISH_BUDGET_MS:
+        print(f"FAIL: publish p99 {publish_p99:.3f}ms over {PUBLISH_BUDGET_MS}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv[1:]))
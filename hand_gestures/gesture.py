@@ -1,4 +1,4 @@
-from enum import Enum, auto
+from enum import Enum
 
 
 class HandGesture(Enum):
@@ -14,5 +14,12 @@ class HandGesture(Enum):
 
 
 class HandsGesture(Enum):
-    NONE = auto()
-    WAKE = auto()
+    NONE = "none"
+    WAKE = "wake"
+
+
+class SwipeGesture(Enum):
+    LEFT = "swipe_left"
+    RIGHT = "swipe_right"
+    UP = "swipe_up"
+    DOWN = "swipe_down"
@@ -0,0 +1,172 @@
+import time
+from typing import Optional, Union
+from gesture import HandGesture, HandsGesture, SwipeGesture
+from hand_side import HandSide
+from hand_state import HandState
+
+# Frames in a row a gesture must be seen before it's emitted, so a one frame
+# misclassification never reaches a consumer
+GESTURE_HOLD_FRAMES = 3
+
+# Seconds an emitted gesture survives flickers to another gesture, low
+# confidence or no hands. Back within this time it isn't emitted again, so
+# toggles like mute or power don't fire twice for one gesture.
+GESTURE_DROPOUT_TIME = 0.5
+
+
+class GestureEvent:
+    # A gesture starting, stamped with the capture time of the frame it was
+    # seen in so consumers can measure glass to action latency. All times are
+    # on the time.monotonic clock.
+
+    def __init__(self,
+                 gesture: Union[HandGesture, HandsGesture, SwipeGesture],
+                 side: Optional[HandSide],
+                 captured_at: float,
+                 decided_at: float):
+        if not isinstance(gesture, (HandGesture, HandsGesture, SwipeGesture)):
+            raise TypeError("gesture must be a HandGesture, HandsGesture or SwipeGesture")
+        if side is not None and not isinstance(side, HandSide):
+            raise TypeError("side must be an instance of HandSide enum or None")
+        self._gesture = gesture
+        self._side = side
+        self._captured_at = float(captured_at)
+        self._decided_at = float(decided_at)
+        self._dispatched_at: Optional[float] = None
+
+    @property
+    def gesture(self) -> Union[HandGesture, HandsGesture, SwipeGesture]:
+        return self._gesture
+
+    @property
+    def side(self) -> Optional[HandSide]:
+        # None for gestures made with both hands
+        return self._side
+
+    @property
+    def captured_at(self) -> float:
+        return self._captured_at
+
+    @property
+    def decided_at(self) -> float:
+        return self._decided_at
+
+    @property
+    def dispatched_at(self) -> Optional[float]:
+        return self._dispatched_at
+
+    @property
+    def decision_latency(self) -> float:
+        return self._decided_at - self._captured_at
+
+    @property
+    def dispatch_latency(self) -> Optional[float]:
+        if self._dispatched_at is None:
+            return None
+        return self._dispatched_at - self._captured_at
+
+    def mark_dispatched(self, now: Optional[float] = None) -> float:
+        # Call once the resulting command has been sent, returns the capture
+        # to dispatch latency
+        self._dispatched_at = time.monotonic() if now is None else now
+        return self._dispatched_at - self._captured_at
+
+    def __repr__(self) -> str:
+        side = f" {self._side.value}" if self._side is not None else ""
+        return f"GestureEvent({self._gesture.value}{side}, {self.decision_latency * 1000:.1f}ms)"
+
+
+class GestureHold:
+    # Debounces one hand's gesture (or the two handed one). A gesture is
+    # emitted once seen for GESTURE_HOLD_FRAMES frames in a row, and the last
+    # emitted one is kept through flickers and dropouts shorter than
+    # GESTURE_DROPOUT_TIME, so it isn't emitted again when it comes back.
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.emitted = None
+        self._seen_at = 0.0
+        self._candidate = None
+        self._frames = 0
+
+    def update(self, gesture, timestamp: float) -> bool:
+        # `gesture` is None for no hand or no confident gesture. Returns True
+        # when `gesture` should be emitted.
+        if gesture is None:
+            self._candidate = None
+            self._frames = 0
+            return False
+
+        if gesture == self.emitted and timestamp - self._seen_at <= GESTURE_DROPOUT_TIME:
+            self._seen_at = timestamp
+            self._candidate = None
+            self._frames = 0
+            return False
+
+        if gesture == self._candidate:
+            self._frames += 1
+        else:
+            self._candidate = gesture
+            self._frames = 1
+        if self._frames < GESTURE_HOLD_FRAMES:
+            return False
+
+        self.emitted = gesture
+        self._seen_at = timestamp
+        self._candidate = None
+        self._frames = 0
+        return True
+
+
+class GestureEventDetector:
+    # Turns the per frame HandState into events, only when a gesture starts.
+    # Holding a gesture emits nothing further, changing it or taking the hand
+    # away for longer than GESTURE_DROPOUT_TIME and back emits again. Swipes
+    # are events by themselves.
+
+    def __init__(self):
+        self._holds: dict[HandSide, GestureHold] = {
+            HandSide.LEFT: GestureHold(),
+            HandSide.RIGHT: GestureHold(),
+        }
+        self._hands_hold = GestureHold()
+
+    def reset(self) -> None:
+        for hold in self._holds.values():
+            hold.reset()
+        self._hands_hold.reset()
+
+    def update(self, hands: Optional[HandState]) -> list[GestureEvent]:
+        # `hands` as returned by HandProcessor.get_state, which stamps it
+        if hands is None:
+            # A frame without hands breaks a gesture being held towards
+            # emission, but a gesture already emitted outlasts a short dropout
+            for hold in self._holds.values():
+                hold.update(None, 0.0)
+            self._hands_hold.update(None, 0.0)
+            return []
+
+        captured_at = hands.captured_at
+        decided_at = hands.decided_at
+        if captured_at is None or decided_at is None:
+            raise ValueError("hands must be stamped with captured_at and decided_at")
+
+        events = []
+        for hand in hands.hand_list:
+            gesture = hand.gesture if hand.visible else None
+            # NONE is a low confidence classification, not a gesture starting
+            if gesture == HandGesture.NONE:
+                gesture = None
+            if self._holds[hand.side].update(gesture, captured_at):
+                events.append(GestureEvent(gesture, hand.side, captured_at, decided_at))
+
+            if hand.visible and hand.swipe is not None:
+                events.append(GestureEvent(hand.swipe, hand.side, captured_at, decided_at))
+
+        gesture = hands.gesture if hands.gesture != HandsGesture.NONE else None
+        if self._hands_hold.update(gesture, captured_at):
+            events.append(GestureEvent(gesture, None, captured_at, decided_at))
+
+        return events
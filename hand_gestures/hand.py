@@ -2,13 +2,14 @@ from typing import Optional
 from hand_side import HandSide
 from digit_type import DigitType
 from digit import Digit
-from gesture import HandGesture
+from gesture import HandGesture, SwipeGesture
 
 
 class Hand:
     def __init__(self, side: HandSide):
         self._side = side
         self._gesture: Optional[HandGesture] = None
+        self._swipe: Optional[SwipeGesture] = None
         self._angle: float = 0.0
         self._visible: bool = False
         self._digits: dict[DigitType, Digit] = {
@@ -58,6 +59,17 @@ class Hand:
             raise TypeError("gesture must be an instance of Gesture or None")
         self._gesture = value
 
+    @property
+    def swipe(self) -> Optional[SwipeGesture]:
+        # Set only on the frame a swipe completes
+        return self._swipe
+
+    @swipe.setter
+    def swipe(self, value: Optional[SwipeGesture]) -> None:
+        if value is not None and not isinstance(value, SwipeGesture):
+            raise TypeError("swipe must be an instance of SwipeGesture or None")
+        self._swipe = value
+
     @property
     def digits(self) -> dict[DigitType, Digit]:
         return self._digits
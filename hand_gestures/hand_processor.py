@@ -1,7 +1,8 @@
 from typing import Optional
-import mediapipe as mp
+import logging
+import threading
+import time
 import cv2
-import joblib
 from digit import Digit
 from hand_side import HandSide
 from digit_direction import DigitDirection
@@ -13,7 +14,19 @@ from math import atan2, degrees
 from hand_state import HandState
 from math_helper import angle_between, vector
 from hand import Hand
-import numpy as np
+from model_watcher import ModelWatcher, load_model
+from motion_cache import MotionCache
+from trajectory import TrajectoryTracker
+import runtime_path  # noqa: F401
+from gesture_runtime.classifier import GestureClassifier
+from gesture_runtime.features import FeatureExtractor
+from gesture_runtime.governor import ResolutionGovernor
+from gesture_runtime.landmarks import LandmarkProvider, mp_hands
+from gesture_runtime.latency import LatencyTracker
+from gesture_runtime.preprocessing import Preprocessor
+from gesture_runtime.timing import StageTimer
+
+logger = logging.getLogger(__name__)
 
 # Threshold for "significantly" higher/lower
 DELTA_VERTICAL_MARGIN = 0.1
@@ -80,9 +93,6 @@ digit_points = {
     ),
 }
 
-# Load model
-model = joblib.load("gesture_model.pkl")
-
 
 class HandProcessor:
     def __init__(self,
@@ -90,26 +100,114 @@ class HandProcessor:
                  min_detection_confidence=0.7,
                  min_tracking_confidence=0.7,
                  detection_width=640,
-                 detection_height=480):
-
-        self.hands = None
+                 detection_height=480,
+                 model_path="gesture_model.pkl",
+                 watch_model=True,
+                 mirror=False,
+                 governor: Optional[ResolutionGovernor] = None):
+
+        self.landmark_provider: Optional[LandmarkProvider] = None
+        self.classifier: Optional[GestureClassifier] = None
+        self.model_path = model_path
+        self.watch_model = watch_model
+        self._model_watcher: Optional[ModelWatcher] = None
+        self._pending_model = None
+        self._pending_model_time = 0.0
+        self._pending_model_lock = threading.Lock()
         self.max_num_hands = max_num_hands
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
         self.detection_width = detection_width
         self.detection_height = detection_height
 
+        # Mirror raw camera frames during preprocessing, folded into the
+        # colour conversion. Leave off for frames the caller already flipped.
+        self.mirror = mirror
+        self.preprocessor = Preprocessor(detection_width, detection_height)
+
+        # Optionally adapt the detection size to a frame time budget, starting
+        # from the governor's level rather than the size given above
+        self.governor = governor
+        self.confidence: Optional[float] = None
+        if governor is not None:
+            self.set_detection_size(*governor.size)
+        self.feature_extractor = FeatureExtractor()
+
+        # Trajectories span frames, unlike the HandState built per frame
+        self.trajectories: dict[HandSide, TrajectoryTracker] = {
+            HandSide.LEFT: TrajectoryTracker(),
+            HandSide.RIGHT: TrajectoryTracker()
+        }
+
+        # Reuse the last classification while a hand holds still
+        self.motion_caches: dict[HandSide, MotionCache] = {
+            HandSide.LEFT: MotionCache(),
+            HandSide.RIGHT: MotionCache()
+        }
+
+        self.timer = StageTimer()
+
+        # Capture to decision latency, callers add "dispatch" once they act
+        self.latency = LatencyTracker()
+
+    def set_detection_size(self, width: int, height: int) -> None:
+        # Landmarks are normalised, so this can change between any two frames
+        self.detection_width = width
+        self.detection_height = height
+        self.preprocessor.detection_width = width
+        self.preprocessor.detection_height = height
+
+    def load_model(self, model_path=None) -> None:
+        # Load and validate a (possibly newer) model version, then queue it to
+        # be swapped in before the next frame
+        if model_path is not None:
+            self.model_path = model_path
+        self.set_model(load_model(self.model_path))
+
+    def set_model(self, model) -> None:
+        # Safe to call from any thread, get_state swaps the reference between
+        # frames so a frame is never classified by two different models
+        with self._pending_model_lock:
+            self._pending_model_time = time.perf_counter()
+            self._pending_model = model
+
+    def _swap_pending_model(self) -> None:
+        # Take and clear the slot together, a model published in between
+        # would be lost for good as the watcher doesn't reload a file twice
+        with self._pending_model_lock:
+            model, self._pending_model = self._pending_model, None
+            published_at = self._pending_model_time
+        if model is None:
+            return
+        self.classifier.model = model
+        for cache in self.motion_caches.values():
+            cache.invalidate()
+        logger.info("Swapped in model %s after %.1fms",
+                    self.model_path, (time.perf_counter() - published_at) * 1000)
+
     def __enter__(self):
-        self.hands = mp.solutions.hands.Hands(
+        if self.classifier is None:
+            self.classifier = GestureClassifier(load_model(self.model_path))
+
+        if self.watch_model:
+            self._model_watcher = ModelWatcher(
+                self.model_path, self.set_model)
+            self._model_watcher.start()
+
+        self.landmark_provider = LandmarkProvider(
             max_num_hands=self.max_num_hands,
             min_detection_confidence=self.min_detection_confidence,
             min_tracking_confidence=self.min_tracking_confidence
-        )
+        ).open()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if self.hands:
-            self.hands.close()
+        if self._model_watcher:
+            self._model_watcher.stop()
+            self._model_watcher = None
+        if self.landmark_provider:
+            self.landmark_provider.close()
+            self.landmark_provider = None
 
     def upate_digit(self, landmarks: NormalizedLandmarkList, digit: Digit) -> None:
         tip_idx, dip_idx, base_idx = digit_points[digit.type]
@@ -162,39 +260,79 @@ class HandProcessor:
 
         return angle_deg  # Positive means rotated counterclockwise
 
-    def draw_landmarks(self, frame, hand_landmarks, width, height):
+    def draw_landmarks(self, frame, hand_landmarks, width, height, mirror=False):
+        # Landmarks come from the mirrored image, so mirror them back when
+        # drawing onto an unflipped frame
+        def point(lm):
+            x = 1.0 - lm.x if mirror else lm.x
+            return int(x * width), int(lm.y * height)
+
         # Draw landmarks as circles
         for lm in hand_landmarks.landmark:
-            x, y = int(lm.x * width), int(lm.y * height)
-            cv2.circle(frame, (x, y), 5, (0, 255, 0), -1)
+            cv2.circle(frame, point(lm), 5, (0, 255, 0), -1)
 
         # Draw connections as lines
-        for connection in mp.solutions.hands.HAND_CONNECTIONS:
+        for connection in mp_hands.HAND_CONNECTIONS:
             start_idx, end_idx = connection
-            start = hand_landmarks.landmark[start_idx]
-            end = hand_landmarks.landmark[end_idx]
-            start_point = (int(start.x * width), int(start.y * height))
-            end_point = (int(end.x * width), int(end.y * height))
+            start_point = point(hand_landmarks.landmark[start_idx])
+            end_point = point(hand_landmarks.landmark[end_idx])
             cv2.line(frame, start_point, end_point, (0, 255, 0), 2)
 
     def process_frame(self, frame: cv2.VideoCapture) -> list:
-        # Resize to detection frame size
-        detection_frame = cv2.resize(
-            frame, (self.detection_width, self.detection_height))
-
-        # Convert colour format
-        image_rgb = cv2.cvtColor(detection_frame, cv2.COLOR_BGR2RGB)
+        # Resize to detection frame size and convert colour format
+        with self.timer.measure("preprocess"):
+            image_rgb = self.preprocessor.to_detection(frame, self.mirror)
 
         # Get hand gesture details
-        results = self.hands.process(image_rgb)
+        with self.timer.measure("landmarks"):
+            results = self.landmark_provider.process(image_rgb)
+
+        # Mean handedness score, the detection confidence MediaPipe reports
+        if results.multi_handedness:
+            scores = [handedness.classification[0].score
+                      for handedness in results.multi_handedness]
+            self.confidence = sum(scores) / len(scores)
+        else:
+            self.confidence = None
 
         return results
 
-    def get_state(self, frame: cv2.VideoCapture, draw_landmarks=False) -> Optional[HandState]:
+    def get_state(self, frame: cv2.VideoCapture, draw_landmarks=False,
+                  captured_at: Optional[float] = None) -> Optional[HandState]:
+        # `captured_at` is the frame's capture time on the time.monotonic
+        # clock (FrameSource.timestamp), defaulting to now
+        if captured_at is None:
+            captured_at = time.monotonic()
+
+        start = time.perf_counter()
+        hands = self._get_state(frame, draw_landmarks, captured_at)
+
+        decided_at = time.monotonic()
+        self.latency.since("decision", captured_at, decided_at)
+        if hands is not None:
+            hands.captured_at = captured_at
+            hands.decided_at = decided_at
+
+        if self.governor is not None:
+            size = self.governor.update(
+                time.perf_counter() - start, self.confidence)
+            if size is not None:
+                self.set_detection_size(*size)
+
+        return hands
+
+    def _get_state(self, frame: cv2.VideoCapture, draw_landmarks: bool, captured_at: float) -> Optional[HandState]:
+        if self._pending_model is not None:
+            self._swap_pending_model()
+
         results = self.process_frame(frame)
 
         # Return None if no results
         if not results.multi_hand_landmarks or not results.multi_handedness:
+            for trajectory in self.trajectories.values():
+                trajectory.reset()
+            for cache in self.motion_caches.values():
+                cache.invalidate()
             return None
 
         # Get hand state for hand side
@@ -216,48 +354,74 @@ class HandProcessor:
             hand = hands[hand_side]
             hand.visible = True
 
-            data = []
-            for lm in hand_landmarks.landmark:
-                data.extend([lm.x, lm.y, lm.z])
-
-            if len(data) == 63:
-                if GESTURE_USE_PROBABILITY:
-
-                    probs = model.predict_proba([data])[0]
-                    confidence = max(probs)
-                    predicted_class = model.classes_[np.argmax(probs)]
-
-                    if confidence >= GESTURE_CONFIDENCE_PROBABILITY_THRESHOLD:
-                        hand.gesture = HandGesture(predicted_class)
-                    else:
-                        hand.gesture = HandGesture.NONE
-                else:
-                    hand.gesture = HandGesture(model.predict([data])[0])
-
-            # Compute hand rotation angle
-            wrist = hand_landmarks.landmark[HandLandmark.WRIST.value]
-            index_mcp = hand_landmarks.landmark[HandLandmark.INDEX_MCP.value]
-
-            hand.angle = self.hand_rotation_angle(wrist, index_mcp, hand_side)
-
-            colinear_digit_count = 0
-            for digit_type in DigitType:
-                digit = hand[digit_type]
+            features = self.feature_extractor.extract(hand_landmarks)
 
-                self.upate_digit(hand_landmarks, digit)
+            cache = self.motion_caches[hand_side]
+            if cache.is_still(features):
+                cache.restore(hand)
+            else:
+                start = time.perf_counter()
+                self.classify_hand(hand_landmarks, features, hand)
+                elapsed = time.perf_counter() - start
+                self.timer.add("classify", elapsed)
+                cache.store(features, hand, elapsed)
 
-                if digit.colinear:
-                    colinear_digit_count += 1
+            # Swipe velocity and duration follow the capture clock, not
+            # when processing got round to the frame
+            hand.swipe = self.trajectories[hand_side].update(
+                hand_landmarks.landmark, timestamp=captured_at)
 
             if self.is_wake_gesture(hands):
                 hands.gesture = HandsGesture.WAKE
 
             if draw_landmarks:
+                height, width = frame.shape[:2]
                 self.draw_landmarks(frame, hand_landmarks,
-                                    self.detection_width, self.detection_height)
+                                    width, height, self.mirror)
+
+        # A hand that dropped out of view starts a fresh trajectory
+        for hand in hands.hand_list:
+            if not hand.visible:
+                self.trajectories[hand.side].reset()
+                self.motion_caches[hand.side].invalidate()
 
         return hands
 
+    def classify_hand(self, hand_landmarks: NormalizedLandmarkList, features, hand: Hand) -> None:
+        self.classify_gesture(features, hand)
+        self.update_digits(hand_landmarks, hand)
+
+    def classify_gesture(self, features, hand: Hand) -> None:
+        if GESTURE_USE_PROBABILITY:
+            predicted_class, confidence = self.classifier.predict(features)
+
+            if confidence >= GESTURE_CONFIDENCE_PROBABILITY_THRESHOLD:
+                hand.gesture = HandGesture(predicted_class)
+            else:
+                hand.gesture = HandGesture.NONE
+        else:
+            hand.gesture = HandGesture(
+                self.classifier.model.predict(features)[0])
+
+    def update_digits(self, hand_landmarks: NormalizedLandmarkList, hand: Hand) -> None:
+        # Compute hand rotation angle
+        wrist = hand_landmarks.landmark[HandLandmark.WRIST.value]
+        index_mcp = hand_landmarks.landmark[HandLandmark.INDEX_MCP.value]
+
+        hand.angle = self.hand_rotation_angle(wrist, index_mcp, hand.side)
+
+        for digit_type in DigitType:
+            self.upate_digit(hand_landmarks, hand[digit_type])
+
+    def metrics(self) -> dict:
+        # Per stage timings (ms) and motion cache effectiveness per hand
+        return {
+            "detection_size": (self.detection_width, self.detection_height),
+            "stages": self.timer.summary(),
+            "latency": self.latency.summary(),
+            "motion_cache": {side.value: cache.metrics() for side, cache in self.motion_caches.items()},
+        }
+
     def is_wake_gesture(self, hands: dict[HandSide, Hand]):
         left_hand = hands[HandSide.LEFT]
         right_hand = hands[HandSide.RIGHT]
@@ -8,6 +8,10 @@ class HandState:
     def __init__(self):
         self._gesture: Optional[HandsGesture] = None
 
+        # time.monotonic of the frame capture and of the finished decision
+        self._captured_at: Optional[float] = None
+        self._decided_at: Optional[float] = None
+
         self._hands: dict[HandSide, Hand] = {
             HandSide.LEFT: Hand(HandSide.LEFT),
             HandSide.RIGHT: Hand(HandSide.RIGHT)
@@ -38,6 +42,26 @@ class HandState:
             raise TypeError("gesture must be an instance of Gesture or None")
         self._gesture = value
 
+    @property
+    def captured_at(self) -> Optional[float]:
+        return self._captured_at
+
+    @captured_at.setter
+    def captured_at(self, value: Optional[float]) -> None:
+        if value is not None and not isinstance(value, (float, int)):
+            raise TypeError("captured_at must be a float or None")
+        self._captured_at = None if value is None else float(value)
+
+    @property
+    def decided_at(self) -> Optional[float]:
+        return self._decided_at
+
+    @decided_at.setter
+    def decided_at(self, value: Optional[float]) -> None:
+        if value is not None and not isinstance(value, (float, int)):
+            raise TypeError("decided_at must be a float or None")
+        self._decided_at = None if value is None else float(value)
+
     @property
     def hands(self) -> dict[HandSide, Hand]:
         return self._hands
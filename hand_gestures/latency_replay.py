@@ -0,0 +1,223 @@
+# Measures glass to action latency against a recorded video with known
+# gesture onsets, for catching latency regressions automatically.
+#
+#   python latency_replay.py <video> <onsets.json> [baseline.json]
+#
+# onsets.json lists the first frame each gesture is fully formed in:
+#
+#   {"onsets": [{"frame": 45, "gesture": "fist", "side": "left"},
+#               {"frame": 130, "gesture": "swipe_right"}]}
+#
+# "gesture" is the gesture's value, e.g. "fist", "swipe_right" or "wake", and
+# "side" is optional. The video is played at its own frame rate, each frame
+# stamped with the time a camera would have delivered it, and frames are
+# dropped when processing falls behind just like a single buffer camera. An
+# onset's latency runs from the delivery time of its onset frame (dropped or
+# not) to the matching event's decision and dispatch.
+#
+# Results are written to RESULTS_PATH. Given a baseline results file the
+# exit status is non-zero when p95 latency regresses beyond the tolerance,
+# as it is for missed onsets or a p95 over budget.
+import json
+import logging
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+import runtime_path  # noqa: F401
+
+from gesture_runtime.frame_source import FrameSource
+from gesture_runtime.governor import ResolutionGovernor
+from gesture_event import GestureEvent, GestureEventDetector
+from hand_processor import HandProcessor
+
+# Config
+RESULTS_PATH = "latency_results.json"
+DET_WIDTH, DET_HEIGHT = 640, 480
+
+# Same detection setup as main.py, latency depends on the detection size
+CAMERA_FPS = 30
+ADAPTIVE_RESOLUTION = True
+CPU_SHARE = 0.8
+
+# Play back in real time, False processes every frame as fast as possible
+# (latency then excludes waiting for frames and dropping them)
+PACED = True
+
+# Events later than this many frames after an onset don't count for it
+MATCH_WINDOW_FRAMES = 30
+
+LATENCY_BUDGET_MS = 250
+REGRESSION_TOLERANCE = 0.2
+
+
+def load_onsets(path: str) -> list[dict]:
+    with open(path) as f:
+        onsets = json.load(f)["onsets"]
+    return sorted(onsets, key=lambda onset: onset["frame"])
+
+
+def replay(video_path: str, hand_processor: HandProcessor) -> tuple[list[tuple[int, GestureEvent]], float, float]:
+    # Returns (frame index, event) for every event, the playback start time
+    # and the frame interval
+    detector = GestureEventDetector()
+    events = []
+
+    with FrameSource(video_path) as frame_source:
+        interval = 1.0 / (frame_source.fps or 30.0)
+        start = time.monotonic()
+
+        while True:
+            frame = frame_source.read()
+            if frame is None:
+                break
+            index = frame_source.frame_index
+
+            if PACED:
+                # When this frame would have come off the camera
+                delivered_at = start + index * interval
+                now = time.monotonic()
+                if now < delivered_at:
+                    time.sleep(delivered_at - now)
+                elif now >= delivered_at + interval:
+                    # The next frame is already out, a live camera would
+                    # have overwritten this one
+                    continue
+            else:
+                delivered_at = frame_source.timestamp
+
+            hands = hand_processor.get_state(frame, False, delivered_at)
+            for event in detector.update(hands):
+                event.mark_dispatched()
+                events.append((index, event))
+
+    return events, start, interval
+
+
+def match(onsets: list[dict], events: list[tuple[int, GestureEvent]], start: float, interval: float) -> list[dict]:
+    # Each event answers for one onset at most, so repeats of a gesture
+    # can't all be credited to the same early event
+    results = []
+    candidates = list(events)
+    for onset in onsets:
+        frame = onset["frame"]
+        result = {"frame": frame, "gesture": onset["gesture"], "side": onset.get("side")}
+
+        for position, (index, event) in enumerate(candidates):
+            if index < frame or index > frame + MATCH_WINDOW_FRAMES:
+                continue
+            if event.gesture.value != onset["gesture"]:
+                continue
+            if onset.get("side") is not None and (event.side is None or event.side.value != onset["side"]):
+                continue
+
+            if PACED:
+                glass = start + frame * interval
+            else:
+                # Unpaced frames have no delivery schedule, measure from the
+                # event's own frame
+                glass = event.captured_at
+            result["detected_frame"] = index
+            result["frames_late"] = index - frame
+            result["decision_ms"] = (event.decided_at - glass) * 1000
+            result["dispatch_ms"] = (event.dispatched_at - glass) * 1000
+            del candidates[position]
+            break
+
+        results.append(result)
+    return results
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    # Exact rather than LatencyHistogram's bucket edges, a replay only has a
+    # handful of onsets and the buckets are wider than the tolerance
+    if not values:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(max(values)),
+    }
+
+
+def summarise(results: list[dict]) -> dict:
+    detected = [result for result in results if "decision_ms" in result]
+    return {
+        "onsets": len(results),
+        "missed": len(results) - len(detected),
+        "decision": percentiles([result["decision_ms"] for result in detected]),
+        "dispatch": percentiles([result["dispatch_ms"] for result in detected]),
+    }
+
+
+def regressions(summary: dict, baseline: Optional[dict] = None) -> list[str]:
+    problems = []
+    if summary["missed"]:
+        problems.append(f"{summary['missed']} of {summary['onsets']} onsets missed")
+
+    p95 = summary["dispatch"]["p95"]
+    if p95 > LATENCY_BUDGET_MS:
+        problems.append(f"dispatch p95 {p95:.0f}ms over the {LATENCY_BUDGET_MS}ms budget")
+
+    if baseline is not None:
+        base = baseline["summary"]["dispatch"]["p95"]
+        if base > 0 and p95 > base * (1 + REGRESSION_TOLERANCE):
+            problems.append(f"dispatch p95 {p95:.0f}ms regressed from baseline {base:.0f}ms")
+    return problems
+
+
+def main(argv):
+    if len(argv) < 2:
+        raise SystemExit("usage: latency_replay.py <video> <onsets.json> [baseline.json]")
+
+    onsets = load_onsets(argv[1])
+    baseline = None
+    if len(argv) > 2:
+        with open(argv[2]) as f:
+            baseline = json.load(f)
+
+    governor = None
+    if ADAPTIVE_RESOLUTION:
+        governor = ResolutionGovernor(
+            ladder=((320, 240), (480, 360), (DET_WIDTH, DET_HEIGHT)),
+            target_fps=CAMERA_FPS,
+            cpu_share=CPU_SHARE)
+
+    with HandProcessor(detection_width=DET_WIDTH,
+                       detection_height=DET_HEIGHT,
+                       watch_model=False,
+                       mirror=True,
+                       governor=governor) as hand_processor:
+        events, start, interval = replay(argv[0], hand_processor)
+
+    results = match(onsets, events, start, interval)
+    summary = summarise(results)
+
+    with open(RESULTS_PATH, "w") as f:
+        json.dump({"video": argv[0], "paced": PACED, "summary": summary, "onsets": results}, f, indent=2)
+
+    print(f"{'frame':>6}  {'gesture':<14}{'late':>6}{'decision':>10}{'dispatch':>10}  (ms)")
+    for result in results:
+        if "decision_ms" in result:
+            print(f"{result['frame']:>6}  {result['gesture']:<14}{result['frames_late']:>6}"
+                  f"{result['decision_ms']:>10.1f}{result['dispatch_ms']:>10.1f}")
+        else:
+            print(f"{result['frame']:>6}  {result['gesture']:<14}  missed")
+
+    for name in ("decision", "dispatch"):
+        stats = summary[name]
+        print(f"{name}: p50 {stats['p50']:.0f}ms p95 {stats['p95']:.0f}ms max {stats['max']:.0f}ms")
+    print(f"Saved results to {RESULTS_PATH}")
+
+    problems = regressions(summary, baseline)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main(sys.argv[1:]))
@@ -1,10 +1,53 @@
 from typing import Tuple
-import numpy as np
+import logging
+import time
 import cv2
 import pyautogui
+
+import runtime_path  # noqa: F401
+
+from gesture_runtime.camera import CameraConfig
+from gesture_runtime.frame_source import FrameSource
+from gesture_runtime.governor import ResolutionGovernor
+from gesture_runtime.preprocessing import Letterbox, Preprocessor
+from consumers import LoggingConsumer
+from event_bus import GestureEventBus
+from gesture_event import GestureEventDetector
 from hand_processor import HandProcessor, digit_names
 from hand_side import HandSide
 
+# Seconds between pipeline metrics log lines
+METRICS_LOG_INTERVAL = 30
+
+# Capture straight at the detection size so frames need no resize
+DET_WIDTH, DET_HEIGHT = 640, 480
+CAMERA_FPS = 30
+CAMERA_FOURCC = "YUYV"
+
+# Drop the detection size on slow boxes to keep up with the camera, using at
+# most CPU_SHARE of each frame interval
+ADAPTIVE_RESOLUTION = True
+CPU_SHARE = 0.8
+
+
+def log_metrics(metrics: dict, bus_metrics: dict) -> None:
+    stages = ", ".join(f"{stage} p50 {stats['p50']:.1f}ms p99 {stats['p99']:.1f}ms"
+                       for stage, stats in metrics["stages"].items())
+    caches = ", ".join(f"{side} {cache['hit_rate']:.0%} hits saved {cache['saved_ms']:.0f}ms"
+                       for side, cache in metrics["motion_cache"].items())
+    logging.info("Detection size: %dx%d", *metrics["detection_size"])
+    logging.info("Stages: %s", stages)
+    logging.info("Motion cache: %s", caches)
+
+    latency = ", ".join(f"{name} p50 {stats['p50']:.0f}ms p95 {stats['p95']:.0f}ms"
+                        for name, stats in metrics["latency"].items())
+    logging.info("Capture to: %s", latency)
+
+    subscribers = ", ".join(f"{name} {stats['delivered']}/{stats['received']} dropped {stats['dropped']} "
+                            f"lag p99 {stats['lag']['p99']:.0f}ms capture to done p95 {stats['latency']['p95']:.0f}ms"
+                            for name, stats in bus_metrics.items())
+    logging.info("Subscribers: %s", subscribers)
+
 
 def draw_text_with_bg(
     img,
@@ -33,46 +76,61 @@ def draw_text_with_bg(
     cv2.putText(img, text, (x, y), font, font_scale, text_color, thickness)
 
 
-def resize_with_aspect_ratio(image, target_width, target_height):
-    h, w = image.shape[:2]
-    scale = min(target_width / w, target_height / h)
-    new_w = int(w * scale)
-    new_h = int(h * scale)
-    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-    # Create black background
-    result = np.zeros((target_height, target_width, 3), dtype=np.uint8)
-
-    # Center the resized image
-    x_offset = (target_width - new_w) // 2
-    y_offset = (target_height - new_h) // 2
-    result[y_offset:y_offset+new_h, x_offset:x_offset+new_w] = resized
-
-    return result
-
+logging.basicConfig(level=logging.INFO)
 
 cv2.namedWindow("Hands", cv2.WINDOW_NORMAL)
-cap = cv2.VideoCapture(0)
+frame_source = FrameSource(0, config=CameraConfig(
+    DET_WIDTH, DET_HEIGHT, CAMERA_FPS, CAMERA_FOURCC)).open()
+event_bus = None
 
 try:
-    OUTPUT_WIDTH = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    OUTPUT_HEIGHT = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    preprocessor = Preprocessor()
+
+    screen_width, screen_height = pyautogui.size()
+    letterbox = Letterbox(screen_width, screen_height)
+
+    last_metrics_time = time.monotonic()
+    event_detector = GestureEventDetector()
+
+    # Nothing is driven from gestures yet, the log line stands in for the
+    # command. The IR and webhook stand-ins only run in event_bus_demo.py
+    # until the hardware and hub are wired up.
+    log_consumer = LoggingConsumer(dispatch=True)
+    event_bus = GestureEventBus()
+    event_bus.subscribe("log", log_consumer)
+    event_bus.start()
+
+    governor = None
+    if ADAPTIVE_RESOLUTION:
+        governor = ResolutionGovernor(
+            ladder=((320, 240), (480, 360), (DET_WIDTH, DET_HEIGHT)),
+            target_fps=CAMERA_FPS,
+            cpu_share=CPU_SHARE)
+
+    with HandProcessor(detection_width=DET_WIDTH,
+                       detection_height=DET_HEIGHT,
+                       mirror=True,
+                       governor=governor) as hand_processor:
+        while frame_source.is_opened():
+            frame = frame_source.read()
+            if frame is None:
+                break
 
-    DET_WIDTH, DET_HEIGHT = 640, 480
+            # Detection mirrors the raw frame itself, only the display
+            # needs a flipped BGR copy
+            hands = hand_processor.get_state(
+                frame, True, frame_source.timestamp)
 
-    with HandProcessor() as hand_processor:
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+            # Gesture transitions only, consumers run on the bus thread
+            event_bus.publish(event_detector.update(hands))
 
-            frame = cv2.flip(frame, 1)
-            hands = hand_processor.get_state(frame, True)
+            if time.monotonic() - last_metrics_time >= METRICS_LOG_INTERVAL:
+                last_metrics_time = time.monotonic()
+                metrics = hand_processor.metrics()
+                metrics["latency"]["dispatch"] = log_consumer.dispatch_latency.summary()
+                log_metrics(metrics, event_bus.metrics())
 
-            # optionally: use pyautogui.size() for dynamic
-            screen_width, screen_height = pyautogui.size()
-            display_frame = resize_with_aspect_ratio(
-                frame, screen_width, screen_height)
+            display_frame = letterbox(preprocessor.mirror(frame))
 
             y_start = 25
             line_height = 25
@@ -129,5 +187,7 @@ try:
                 break
 
 finally:
-    cap.release()
+    if event_bus is not None:
+        event_bus.stop()
+    frame_source.close()
     cv2.destroyAllWindows()
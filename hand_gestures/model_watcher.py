@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+import numpy as np
+from gesture import HandGesture
+import runtime_path  # noqa: F401
+from gesture_runtime.classifier import read_model
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the model file
+MODEL_POLL_INTERVAL = 1.0
+
+# Normalised landmarks (x, y, z) of an open hand, palm to the camera. Only used
+# as a smoke test that a newly loaded model accepts our feature layout.
+CANNED_LANDMARKS = [
+    (0.50, 0.80, 0.00),
+    (0.44, 0.76, -0.02), (0.40, 0.70, -0.03), (0.37, 0.65, -0.04), (0.34, 0.61, -0.05),
+    (0.45, 0.60, -0.01), (0.44, 0.52, -0.02), (0.44, 0.47, -0.03), (0.43, 0.43, -0.04),
+    (0.50, 0.59, -0.01), (0.50, 0.50, -0.02), (0.50, 0.44, -0.03), (0.50, 0.40, -0.04),
+    (0.55, 0.60, -0.01), (0.56, 0.52, -0.02), (0.56, 0.47, -0.03), (0.57, 0.43, -0.04),
+    (0.59, 0.63, -0.01), (0.61, 0.57, -0.02), (0.62, 0.53, -0.03), (0.63, 0.50, -0.04),
+]
+
+CANNED_FEATURES = np.array(CANNED_LANDMARKS, dtype=np.float64).reshape(1, -1)
+
+
+def validate_model(model) -> None:
+    # Raises ValueError if the model can't be used by HandProcessor
+    if not hasattr(model, "predict_proba") or not hasattr(model, "classes_"):
+        raise ValueError("model must be a fitted classifier")
+
+    n_features = getattr(model, "n_features_in_", CANNED_FEATURES.shape[1])
+    if n_features != CANNED_FEATURES.shape[1]:
+        raise ValueError(
+            f"model expects {n_features} features, not {CANNED_FEATURES.shape[1]}")
+
+    for label in model.classes_:
+        # Raises ValueError for labels that aren't a known gesture
+        HandGesture(label)
+
+    probs = model.predict_proba(CANNED_FEATURES)
+    if probs.shape != (1, len(model.classes_)):
+        raise ValueError(f"unexpected prediction shape {probs.shape}")
+
+
+def load_model(path: str):
+    model = read_model(path)
+    validate_model(model)
+    return model
+
+
+class ModelWatcher:
+    # Watches a model file and loads new versions on a background thread. The
+    # frame loop is never blocked, new models are handed over via `on_loaded`.
+
+    def __init__(self,
+                 path: str,
+                 on_loaded: Callable[[object], None],
+                 poll_interval: float = MODEL_POLL_INTERVAL):
+        self.path = path
+        self.on_loaded = on_loaded
+        self.poll_interval = poll_interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._signature = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                continue
+
+            # Wait for the file to stop changing so a copy in progress isn't
+            # loaded half written
+            if self._stop.wait(self.poll_interval) or self._stat() != signature:
+                continue
+
+            self._signature = signature
+            self._reload()
+
+    def _reload(self) -> None:
+        start = time.perf_counter()
+        try:
+            model = read_model(self.path)
+            loaded = time.perf_counter()
+            validate_model(model)
+        except Exception:
+            logger.exception("Rejected model %s", self.path)
+            return
+
+        validated = time.perf_counter()
+        logger.info("Loaded model %s (load %.1fms, validate %.1fms)",
+                    self.path, (loaded - start) * 1000, (validated - loaded) * 1000)
+
+        self.on_loaded(model)
@@ -0,0 +1,87 @@
+from typing import Optional
+import numpy as np
+from digit_type import DigitType
+from hand import Hand
+
+# Largest per coordinate landmark movement (normalised frame units) that still
+# counts as the hand holding still
+MOTION_THRESHOLD = 0.004
+
+# Reclassify at least this often even when the hand holds still
+MOTION_REFRESH_FRAMES = 15
+
+
+class MotionCache:
+    # Remembers the classification of one hand and reuses it while the
+    # landmarks barely move, skipping the model and the digit geometry
+
+    def __init__(self,
+                 threshold: float = MOTION_THRESHOLD,
+                 refresh_frames: int = MOTION_REFRESH_FRAMES):
+        self.threshold = threshold
+        self.refresh_frames = refresh_frames
+        self.hits = 0
+        self.misses = 0
+        self.saved_time = 0.0
+        self._miss_time = 0.0
+        self._features: Optional[np.ndarray] = None
+        self._delta: Optional[np.ndarray] = None
+        self._frames_since_refresh = 0
+        self._gesture = None
+        self._angle = 0.0
+        self._digits = []
+
+    def invalidate(self) -> None:
+        self._features = None
+
+    def is_still(self, features: np.ndarray) -> bool:
+        if self._features is None or self._frames_since_refresh >= self.refresh_frames:
+            return False
+
+        # max(|current - cached|) without allocating per frame
+        np.subtract(features, self._features, out=self._delta)
+        np.abs(self._delta, out=self._delta)
+        return self._delta.max() < self.threshold
+
+    def restore(self, hand: Hand) -> None:
+        self.hits += 1
+        self.saved_time += self._miss_time
+        self._frames_since_refresh += 1
+
+        hand.gesture = self._gesture
+        hand.angle = self._angle
+        for digit_type, (angle, colinear, direction) in zip(DigitType, self._digits):
+            digit = hand[digit_type]
+            digit.angle = angle
+            digit.colinear = colinear
+            digit.direction = direction
+
+    def store(self, features: np.ndarray, hand: Hand, elapsed: float) -> None:
+        self.misses += 1
+        self._frames_since_refresh = 0
+
+        # Running average of what a full classification costs
+        self._miss_time += (elapsed - self._miss_time) / min(self.misses, 100)
+
+        if self._features is None:
+            self._features = np.empty_like(features)
+            self._delta = np.empty_like(features)
+        np.copyto(self._features, features)
+
+        self._gesture = hand.gesture
+        self._angle = hand.angle
+        self._digits = [(digit.angle, digit.colinear, digit.direction)
+                        for digit in (hand[digit_type] for digit_type in DigitType)]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def metrics(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "saved_ms": self.saved_time * 1000,
+        }
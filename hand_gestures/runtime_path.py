@@ -0,0 +1,11 @@
+# The shared gesture runtime lives in the repository root. Importing this
+# module puts the root on sys.path, so the flat hand_gestures modules can
+# import gesture_runtime whichever script, shell or test imports them first.
+import os
+import sys
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), ".."))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
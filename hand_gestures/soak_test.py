@@ -0,0 +1,292 @@
+# Replays a recorded video on a loop through HandProcessor as fast as it
+# will go, sampling memory, object counts and stage latency at intervals into
+# a JSON lines time series. Slow leaks and latency drift show up as flags in
+# the log and a summary at the end.
+#
+#   python soak_test.py <video> [hours] [output]
+#
+# An existing series can be re-checked without running anything:
+#
+#   python soak_test.py --report <output>
+#
+# Flags raised at any point of the run count, not only those still true at
+# the end, so a leak that plateaus or a latency spike that recovers still
+# fails the run.
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import runtime_path  # noqa: F401
+
+from gesture_runtime.frame_source import FrameSource
+from gesture_runtime.latency import FINE_BUCKET_EDGES_MS, LatencyTracker
+from hand_processor import HandProcessor
+
+logger = logging.getLogger(__name__)
+
+# Config
+DEFAULT_HOURS = 8.0
+OUTPUT_PATH = "soak.jsonl"
+DET_WIDTH, DET_HEIGHT = 640, 480
+
+# Seconds between samples
+SAMPLE_INTERVAL = 60
+
+# Samples ignored while caches, MediaPipe's graph and the allocator warm up,
+# the sample after them is the baseline
+WARMUP_SAMPLES = 3
+
+# Python heap tracking costs a few percent per frame, set False to soak
+# without it (RSS and object counts still work). More frames group the top
+# allocators by call stack, at a much higher snapshot cost.
+TRACE_MALLOC = True
+TRACEMALLOC_FRAMES = 1
+TOP_ALLOCATORS = 10
+TOP_TYPES = 10
+
+# Flags: growth from the baseline beyond these limits...
+RSS_GROWTH_LIMIT_MB = 50
+OBJECT_GROWTH_LIMIT = 50000
+LATENCY_DRIFT_LIMIT = 0.5  # fraction above the baseline p99
+
+# ...or this many consecutive samples that never go down and grow at least
+# the minimum overall
+MONOTONIC_SAMPLES = 10
+MONOTONIC_RSS_MB = 5
+MONOTONIC_OBJECTS = 1000
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb() -> float:
+    # Resident set size from /proc, falls back to the peak on other systems
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / (1024 * 1024)
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def object_counts() -> tuple[int, dict[str, int]]:
+    objects = gc.get_objects()
+    types = Counter(type(o).__name__ for o in objects)
+    return len(objects), dict(types.most_common(TOP_TYPES))
+
+
+def top_allocators(snapshot, baseline) -> list[dict]:
+    # Largest growth in Python allocations since the baseline snapshot
+    if baseline is None:
+        stats = snapshot.statistics("traceback")[:TOP_ALLOCATORS]
+        return [{"where": str(s.traceback[0]), "kb": s.size / 1024, "count": s.count} for s in stats]
+
+    stats = snapshot.compare_to(baseline, "traceback")[:TOP_ALLOCATORS]
+    return [{"where": str(s.traceback[0]), "kb": s.size / 1024, "growth_kb": s.size_diff / 1024,
+             "count": s.count} for s in stats]
+
+
+def is_monotonic(values: list[float], minimum: float) -> bool:
+    if len(values) < MONOTONIC_SAMPLES:
+        return False
+    window = values[-MONOTONIC_SAMPLES:]
+    rising = all(b >= a for a, b in zip(window, window[1:]))
+    return rising and window[-1] - window[0] >= minimum
+
+
+def check(samples: list[dict]) -> dict[str, str]:
+    # Returns a description of every threshold the series currently breaks,
+    # keyed by what broke it
+    if len(samples) <= WARMUP_SAMPLES:
+        return {}
+
+    series = samples[WARMUP_SAMPLES:]
+    baseline, latest = series[0], series[-1]
+    flags = {}
+
+    rss_growth = latest["rss_mb"] - baseline["rss_mb"]
+    if rss_growth > RSS_GROWTH_LIMIT_MB:
+        flags["rss_growth"] = f"RSS grew {rss_growth:.1f}MB since baseline"
+    if is_monotonic([s["rss_mb"] for s in series], MONOTONIC_RSS_MB):
+        flags["rss_rising"] = f"RSS rising for {MONOTONIC_SAMPLES} samples"
+
+    object_growth = latest["objects"] - baseline["objects"]
+    if object_growth > OBJECT_GROWTH_LIMIT:
+        flags["object_growth"] = f"{object_growth} more live objects since baseline"
+    if is_monotonic([s["objects"] for s in series], MONOTONIC_OBJECTS):
+        flags["objects_rising"] = f"live objects rising for {MONOTONIC_SAMPLES} samples"
+
+    for stage, stats in latest["stages"].items():
+        base = baseline["stages"].get(stage)
+        if base is None or base["p99"] <= 0:
+            continue
+        drift = stats["p99"] / base["p99"] - 1
+        if drift > LATENCY_DRIFT_LIMIT:
+            flags[f"{stage}_p99"] = (f"{stage} p99 {stats['p99']:.2f}ms is {drift:.0%} "
+                                     f"above baseline {base['p99']:.2f}ms")
+
+    return flags
+
+
+def flag_history(samples: list[dict]) -> dict[str, str]:
+    # Every flag raised anywhere in the series, first occurrence of each kind,
+    # both as recorded during the run and as check() sees each prefix now
+    flagged = {}
+    for i, sample in enumerate(samples):
+        for kind, flag in sample.get("flags", {}).items():
+            flagged.setdefault(kind, flag)
+        for kind, flag in check(samples[:i + 1]).items():
+            flagged.setdefault(kind, flag)
+    return flagged
+
+
+def take_sample(hand_processor: HandProcessor, start: float, frames: int, interval_frames: int,
+                interval: float, snapshot_baseline) -> tuple[dict, object]:
+    objects, types = object_counts()
+    sample = {
+        "elapsed_s": time.monotonic() - start,
+        "frames": frames,
+        "fps": interval_frames / interval if interval > 0 else 0.0,
+        "rss_mb": rss_mb(),
+        "objects": objects,
+        "gc_counts": gc.get_count(),
+        "top_types": types,
+        "stages": hand_processor.timer.summary(),
+    }
+
+    snapshot = None
+    if tracemalloc.is_tracing():
+        # Leave out tracemalloc's own bookkeeping
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),))
+        sample["traced_mb"] = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        sample["top_allocators"] = top_allocators(snapshot, snapshot_baseline)
+
+    # Latency is reported per interval, not over the whole run
+    hand_processor.timer.reset()
+    return sample, snapshot
+
+
+def soak(video_path: str, hours: float, output_path: str) -> tuple[list[dict], dict[str, str]]:
+    # Returns the samples and every flag raised during the run
+    samples = []
+    snapshot_baseline = None
+    flagged = {}
+
+    with FrameSource(video_path, loop=True) as frame_source, \
+            HandProcessor(detection_width=DET_WIDTH,
+                          detection_height=DET_HEIGHT,
+                          watch_model=False,
+                          mirror=True) as hand_processor, \
+            open(output_path, "w") as output:
+        # The default StageTimer only keeps the last 1000 frames, a fraction
+        # of an interval at replay speed. Histograms see every frame of the
+        # interval so an early spike still reaches check().
+        hand_processor.timer = LatencyTracker(edges=FINE_BUCKET_EDGES_MS)
+
+        # Trace after the model and MediaPipe are loaded, their allocations
+        # are fixed and would only slow every snapshot down
+        if TRACE_MALLOC:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        start = last_sample = time.monotonic()
+        deadline = start + hours * 3600
+        frames = interval_frames = 0
+
+        while time.monotonic() < deadline:
+            frame = frame_source.read()
+            if frame is None:
+                raise IOError(f"Unable to read from {video_path!r}")
+
+            hand_processor.get_state(frame)
+            frames += 1
+            interval_frames += 1
+
+            now = time.monotonic()
+            if now - last_sample < SAMPLE_INTERVAL:
+                continue
+
+            sample, snapshot = take_sample(hand_processor, start, frames, interval_frames,
+                                           now - last_sample, snapshot_baseline)
+            samples.append(sample)
+            sample["flags"] = check(samples)
+            output.write(json.dumps(sample) + "\n")
+            output.flush()
+
+            if len(samples) == WARMUP_SAMPLES + 1:
+                snapshot_baseline = snapshot
+
+            logger.info("%.1fh: %d frames, %.1f fps, RSS %.1fMB, %d objects",
+                        sample["elapsed_s"] / 3600, frames, sample["fps"],
+                        sample["rss_mb"], sample["objects"])
+
+            # Log each kind of flag once when it first appears
+            for kind, flag in sample["flags"].items():
+                if kind not in flagged:
+                    flagged[kind] = flag
+                    logger.warning("Soak: %s", flag)
+
+            last_sample = time.monotonic()
+            interval_frames = 0
+
+    return samples, flagged
+
+
+def load_samples(path: str) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def report(samples: list[dict], flagged: dict[str, str]) -> int:
+    if not samples:
+        print("No samples")
+        return 1
+
+    first, last = samples[0], samples[-1]
+    print(f"{len(samples)} samples over {last['elapsed_s'] / 3600:.2f}h, {last['frames']} frames")
+    print(f"RSS {first['rss_mb']:.1f}MB -> {last['rss_mb']:.1f}MB, "
+          f"objects {first['objects']} -> {last['objects']}")
+    for stage, stats in last["stages"].items():
+        print(f"  {stage:<14} p99 {stats['p99']:.2f}ms")
+
+    if last.get("top_allocators"):
+        print("Top allocators:")
+        for allocator in last["top_allocators"]:
+            growth = allocator.get("growth_kb")
+            growth = f" ({growth:+.1f}KB)" if growth is not None else ""
+            print(f"  {allocator['kb']:>10.1f}KB{growth}  {allocator['where']}")
+
+    # Flags still true at the end take their current wording
+    flags = {**flagged, **check(samples)}
+    for flag in flags.values():
+        print(f"FLAG: {flag}")
+    if not flags:
+        print("No growth or drift beyond thresholds")
+    return 1 if flags else 0
+
+
+def main(argv):
+    if len(argv) == 2 and argv[0] == "--report":
+        samples = load_samples(argv[1])
+        return report(samples, flag_history(samples))
+
+    if not argv:
+        raise SystemExit("usage: soak_test.py <video> [hours] [output]\n"
+                         "       soak_test.py --report <output>")
+
+    video_path = argv[0]
+    hours = float(argv[1]) if len(argv) > 1 else DEFAULT_HOURS
+    output_path = argv[2] if len(argv) > 2 else OUTPUT_PATH
+
+    samples, flagged = soak(video_path, hours, output_path)
+    return report(samples, flagged)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,127 @@
+# Pushes synthetic hands through the post-detection pipeline of HandProcessor
+# (feature extraction, classification, digit updates, wake gesture) and
+# reports throughput and tail latency per stage. MediaPipe isn't involved.
+#
+#   python stress_test.py [samples] [model]
+#
+# The model can be the pickled forest or the quantized .npz export.
+import os
+import sys
+import time
+
+import runtime_path  # noqa: F401
+
+from gesture_runtime.classifier import GestureClassifier
+from gesture_runtime.synthetic import SyntheticLandmarks
+from gesture_runtime.latency import FINE_BUCKET_EDGES_MS, LatencyTracker
+from hand_processor import HandProcessor
+from hand_side import HandSide
+from hand_state import HandState
+from model_watcher import load_model
+
+# Config
+CSV_PATH = "../training/hand_landmarks.csv"
+MODEL_PATH = "gesture_model.pkl"
+TOTAL_SAMPLES = 20000
+BATCH_SIZE = 10000
+
+# Batched predict_proba throughput, for comparison with per frame calls
+BATCH_CLASSIFY_SIZE = 1000
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class LandmarkList:
+    # Just enough of NormalizedLandmarkList for HandProcessor
+    __slots__ = ("landmark",)
+
+    def __init__(self, row):
+        self.landmark = [Landmark(row[i], row[i + 1], row[i + 2])
+                         for i in range(0, len(row), 3)]
+
+
+def run(processor: HandProcessor, generator: SyntheticLandmarks, timer: LatencyTracker, total: int) -> int:
+    processed = 0
+    for X, _ in generator.batches(total, BATCH_SIZE):
+        # Building the landmark objects isn't part of the pipeline
+        hand_lists = [LandmarkList(row) for row in X.tolist()]
+
+        # Consecutive samples form the left and right hand of one frame
+        for i in range(0, len(hand_lists) - 1, 2):
+            frame_start = time.perf_counter()
+            hands = HandState()
+
+            for side, hand_landmarks in ((HandSide.LEFT, hand_lists[i]), (HandSide.RIGHT, hand_lists[i + 1])):
+                hand = hands[side]
+                hand.visible = True
+
+                with timer.measure("features"):
+                    features = processor.feature_extractor.extract(hand_landmarks)
+
+                # The two halves of HandProcessor.classify_hand
+                with timer.measure("classify"):
+                    processor.classify_gesture(features, hand)
+
+                with timer.measure("digits"):
+                    processor.update_digits(hand_landmarks, hand)
+
+            with timer.measure("wake"):
+                processor.is_wake_gesture(hands)
+
+            timer.add("frame", time.perf_counter() - frame_start)
+            processed += 2
+
+    return processed
+
+
+def run_batched(processor: HandProcessor, generator: SyntheticLandmarks) -> float:
+    X, _ = generator.generate(BATCH_CLASSIFY_SIZE * 10)
+    start = time.perf_counter()
+    for i in range(0, len(X), BATCH_CLASSIFY_SIZE):
+        processor.classifier.model.predict_proba(X[i:i + BATCH_CLASSIFY_SIZE])
+    return len(X) / (time.perf_counter() - start)
+
+
+def main(argv):
+    total = int(argv[0]) if len(argv) > 0 else TOTAL_SAMPLES
+    model_path = argv[1] if len(argv) > 1 else MODEL_PATH
+
+    if not os.path.exists(CSV_PATH):
+        raise SystemExit(f"Dataset not found: {CSV_PATH}")
+
+    generator = SyntheticLandmarks.from_csv(CSV_PATH, seed=42)
+
+    processor = HandProcessor(model_path=model_path, watch_model=False)
+    processor.classifier = GestureClassifier(load_model(model_path))
+
+    # Fixed size histograms, a million sample run mustn't grow the heap it's
+    # meant to watch. Percentiles resolve to a bucket edge.
+    timer = LatencyTracker(edges=FINE_BUCKET_EDGES_MS)
+
+    start = time.perf_counter()
+    processed = run(processor, generator, timer, total)
+    elapsed = time.perf_counter() - start
+
+    # Throughput over pipeline time only, elapsed also covers generation
+    frames = timer.summary()["frame"]
+    pipeline_time = frames["mean"] * frames["count"] / 1000
+    print(f"Processed {processed} synthetic hands in {elapsed:.1f}s, "
+          f"{processed / pipeline_time:.0f} hands/s through the pipeline")
+    print(f"frame p99.9: {timer.histogram('frame').percentile(99.9):.3f}ms")
+    print(f"{'stage':<14}{'count':>8}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}  (ms)")
+    for stage, stats in timer.summary().items():
+        print(f"{stage:<14}{stats['count']:>8}{stats['mean']:>10.3f}{stats['p50']:>10.3f}"
+              f"{stats['p99']:>10.3f}{stats['max']:>10.3f}")
+
+    print(f"Batched classification: {run_batched(processor, generator):.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
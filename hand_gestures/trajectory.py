@@ -0,0 +1,139 @@
+import time
+from math import hypot
+from typing import Optional
+from gesture import SwipeGesture
+from hand_landmark import HandLandmark
+
+# Frames of history kept per hand
+TRAJECTORY_WINDOW = 12
+
+# Oldest sample considered part of a swipe, bounds the detection latency
+SWIPE_MAX_DURATION = 0.6
+
+# Minimum travel (normalised frame units) along the swipe axis
+SWIPE_MIN_DISTANCE = 0.25
+
+# Travel along the swipe axis must dominate travel across it by this ratio
+SWIPE_AXIS_RATIO = 2.0
+
+# Net displacement / path length, rejects jitter and back and forth waving
+SWIPE_MIN_STRAIGHTNESS = 0.8
+
+# Ignore further swipes for this long after one fires
+SWIPE_COOLDOWN = 0.5
+
+# Landmarks whose mean position is tracked
+TRACKED_LANDMARKS = (
+    HandLandmark.WRIST.value,
+    HandLandmark.THUMB_TIP.value,
+    HandLandmark.INDEX_TIP.value,
+    HandLandmark.MIDDLE_TIP.value,
+    HandLandmark.RING_TIP.value,
+    HandLandmark.PINKY_TIP.value,
+)
+
+
+class TrajectoryTracker:
+    # Streaming swipe detection for one hand. Keeps a ring buffer of the mean
+    # wrist/fingertip position and maintains the window displacement, path
+    # length and velocity incrementally, so each update is O(1) no matter how
+    # long the window is.
+
+    def __init__(self, window: int = TRAJECTORY_WINDOW, max_duration: float = SWIPE_MAX_DURATION):
+        if window < 2:
+            raise ValueError("window must be at least 2 frames")
+        self.window = window
+        self.max_duration = max_duration
+        self._x = [0.0] * window
+        self._y = [0.0] * window
+        self._t = [0.0] * window
+        self._step = [0.0] * window
+        self._cooldown_until = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        self._head = 0
+        self._count = 0
+        self._path_length = 0.0
+        self.velocity = (0.0, 0.0)
+
+    def _oldest(self) -> int:
+        return (self._head - self._count) % self.window
+
+    def _drop_oldest(self) -> None:
+        # The step leaving the window is the one into the new oldest sample
+        self._count -= 1
+        self._path_length -= self._step[self._oldest()]
+
+    def update(self, landmarks, timestamp: Optional[float] = None) -> Optional[SwipeGesture]:
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        x = 0.0
+        y = 0.0
+        for idx in TRACKED_LANDMARKS:
+            lm = landmarks[idx]
+            x += lm.x
+            y += lm.y
+        x /= len(TRACKED_LANDMARKS)
+        y /= len(TRACKED_LANDMARKS)
+
+        if self._count == self.window:
+            self._drop_oldest()
+
+        if self._count > 0:
+            last = (self._head - 1) % self.window
+            dt = timestamp - self._t[last]
+            step = hypot(x - self._x[last], y - self._y[last])
+            if dt > 0:
+                self.velocity = ((x - self._x[last]) / dt,
+                                 (y - self._y[last]) / dt)
+        else:
+            step = 0.0
+
+        head = self._head
+        self._x[head] = x
+        self._y[head] = y
+        self._t[head] = timestamp
+        self._step[head] = step
+        self._path_length += step
+        self._head = (head + 1) % self.window
+        self._count += 1
+
+        # Samples too old to be part of one swipe leave the window early
+        while self._count > 1 and timestamp - self._t[self._oldest()] > self.max_duration:
+            self._drop_oldest()
+
+        if timestamp < self._cooldown_until:
+            return None
+
+        swipe = self._detect()
+        if swipe is not None:
+            # Start over so the same movement can't fire twice
+            self._cooldown_until = timestamp + SWIPE_COOLDOWN
+            self.reset()
+        return swipe
+
+    @property
+    def displacement(self) -> tuple[float, float]:
+        if self._count < 2:
+            return (0.0, 0.0)
+        oldest = self._oldest()
+        newest = (self._head - 1) % self.window
+        return (self._x[newest] - self._x[oldest], self._y[newest] - self._y[oldest])
+
+    def _detect(self) -> Optional[SwipeGesture]:
+        dx, dy = self.displacement
+        distance = hypot(dx, dy)
+        if distance < SWIPE_MIN_DISTANCE or self._path_length <= 0:
+            return None
+
+        if distance / self._path_length < SWIPE_MIN_STRAIGHTNESS:
+            return None
+
+        # Frames are mirrored, so +x is the user's right and +y is down
+        if abs(dx) >= SWIPE_AXIS_RATIO * abs(dy):
+            return SwipeGesture.RIGHT if dx > 0 else SwipeGesture.LEFT
+        if abs(dy) >= SWIPE_AXIS_RATIO * abs(dx):
+            return SwipeGesture.DOWN if dy > 0 else SwipeGesture.UP
+        return None
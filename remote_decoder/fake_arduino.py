@@ -0,0 +1,140 @@
+# Stands in for the remote_decoder Arduino on a pseudo terminal, for trying
+# serial_reader.py without the hardware:
+#
+#   python fake_arduino.py [codes per second]
+#   python serial_reader.py /dev/pts/N --learn
+#
+# It prints the ready banner, then reports random codes from the firmware's
+# table (and the odd unknown code and repeat) in the same text format, and
+# answers the B/T commands by switching to binary frames and back.
+import os
+import pty
+import random
+import select
+import sys
+import threading
+import time
+import tty
+from typing import Optional
+
+from serial_reader import (BINARY_ACK, FRAME_SYNC, INO_PATH, READY_BANNER,
+                           REPEAT_CODE, TEXT_ACK, CodeTable)
+
+# Config
+DEFAULT_RATE = 10.0
+UNKNOWN_CHANCE = 0.05
+REPEAT_CHANCE = 0.1
+
+# Codes that aren't in the firmware's table
+UNKNOWN_CODES = (0x1FE48B7, 0x1FE807F, 0x1FE40BF)
+
+
+def text_report(code: int, label: str) -> bytes:
+    return f"Received code: 0x{code:X} - {label}\r\n".encode()
+
+
+def binary_report(code: int) -> bytes:
+    b1, b2, b3, b4 = code.to_bytes(4, "big")
+    return bytes((FRAME_SYNC, b1, b2, b3, b4, b1 ^ b2 ^ b3 ^ b4))
+
+
+class FakeArduino:
+    # Runs the firmware loop on a thread, writing to the master side of a pty.
+    # Open `port` (the slave side) like the real serial device. Every code
+    # sent is appended to `sent` so a test can compare it with what was read.
+
+    def __init__(self,
+                 table: Optional[CodeTable] = None,
+                 rate: float = DEFAULT_RATE,
+                 seed: Optional[int] = None):
+        self.table = table or CodeTable.from_ino(INO_PATH)
+        self.interval = 1.0 / rate
+        self.rng = random.Random(seed)
+        self.binary = False
+        self.sent: list[int] = []
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'FakeArduino':
+        self._thread = threading.Thread(target=self._run, name="FakeArduino", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        os.close(self._master)
+        os.close(self._slave)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _write(self, data: bytes) -> None:
+        # A real UART doesn't wait for a listener, drop what doesn't fit
+        try:
+            os.write(self._master, data)
+        except BlockingIOError:
+            pass
+
+    def _next_code(self) -> tuple[int, str]:
+        roll = self.rng.random()
+        if roll < REPEAT_CHANCE:
+            return REPEAT_CODE, "Unknown"
+        if roll < REPEAT_CHANCE + UNKNOWN_CHANCE:
+            return self.rng.choice(UNKNOWN_CODES), "Unknown"
+        code = self.rng.choice(list(self.table.codes))
+        return code, self.table.codes[code]
+
+    def _handle_commands(self, commands: bytes) -> None:
+        for command in commands.split():
+            if command == b"B":
+                self._write(BINARY_ACK + b"\r\n")
+                self.binary = True
+            elif command == b"T":
+                self._write(TEXT_ACK + b"\r\n")
+                self.binary = False
+
+    def _run(self) -> None:
+        self._write(READY_BANNER + b"\r\n")
+        next_report = time.monotonic()
+        while not self._stop.is_set():
+            timeout = max(0.0, next_report - time.monotonic())
+            readable, _, _ = select.select([self._master], [], [], timeout)
+            if readable:
+                try:
+                    self._handle_commands(os.read(self._master, 64))
+                except (BlockingIOError, OSError):
+                    # Nothing to read or the reader closed the port, keep
+                    # going until stopped
+                    pass
+                continue
+
+            code, label = self._next_code()
+            report = binary_report(code) if self.binary else text_report(code, label)
+            self._write(report)
+            self.sent.append(code)
+            next_report += self.interval
+
+
+def main(argv):
+    rate = float(argv[0]) if argv else DEFAULT_RATE
+    with FakeArduino(rate=rate) as arduino:
+        print(f"Fake remote_decoder on {arduino.port}, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
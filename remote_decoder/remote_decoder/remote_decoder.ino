@@ -45,6 +45,38 @@ const int SEND_PIN = 3;
 
 IRsend irsend(SEND_PIN);
 
+// Reporting mode, switched by sending "B\n" (binary) or "T\n" (text). Binary
+// reports are 6 bytes: sync, 4 byte big endian code, XOR of the code bytes.
+// The mode is acked in text, before switching to binary or after switching
+// back, so the host knows where the frames start and end.
+const uint8_t FRAME_SYNC = 0xA5;
+bool binaryMode = false;
+
+void handleCommands() {
+  while (Serial.available() > 0) {
+    char command = Serial.read();
+    if (command == 'B') {
+      Serial.println("Mode binary");
+      binaryMode = true;
+    } else if (command == 'T') {
+      binaryMode = false;
+      Serial.println("Mode text");
+    }
+  }
+}
+
+void sendBinaryCode(uint32_t code) {
+  uint8_t bytes[4] = {
+    (uint8_t)(code >> 24),
+    (uint8_t)(code >> 16),
+    (uint8_t)(code >> 8),
+    (uint8_t)code
+  };
+  Serial.write(FRAME_SYNC);
+  Serial.write(bytes, 4);
+  Serial.write(bytes[0] ^ bytes[1] ^ bytes[2] ^ bytes[3]);
+}
+
 void setup() {
   Serial.begin(115200);
   IrReceiver.begin(RECV_PIN, ENABLE_LED_FEEDBACK);  // Receiver on pin 2 with LED feedback
@@ -52,22 +84,30 @@ void setup() {
 }
 
 void loop() {
+  handleCommands();
+
   // Receiving code
   if (IrReceiver.decode()) {
     uint32_t receivedCode = IrReceiver.decodedIRData.decodedRawData;
-    const char* matchedLabel = "Unknown";
 
-    for (int i = 0; i < numButtons; i++) {
-      if (receivedCode == buttonCodes[i].code) {
-        matchedLabel = buttonCodes[i].label;
-        break;
+    if (binaryMode) {
+      // The host looks the code up itself
+      sendBinaryCode(receivedCode);
+    } else {
+      const char* matchedLabel = "Unknown";
+
+      for (int i = 0; i < numButtons; i++) {
+        if (receivedCode == buttonCodes[i].code) {
+          matchedLabel = buttonCodes[i].label;
+          break;
+        }
       }
-    }
 
-    Serial.print("Received code: 0x");
-    Serial.print(receivedCode, HEX);
-    Serial.print(" - ");
-    Serial.println(matchedLabel);
+      Serial.print("Received code: 0x");
+      Serial.print(receivedCode, HEX);
+      Serial.print(" - ");
+      Serial.println(matchedLabel);
+    }
 
     IrReceiver.resume(); // Ready for next code
   }
@@ -87,8 +127,10 @@ void loop() {
     }
 
     if (muteIndex != -1) {
-      Serial.print("Sending code for ");
-      Serial.println(buttonCodes[muteIndex].label);
+      if (!binaryMode) {
+        Serial.print("Sending code for ");
+        Serial.println(buttonCodes[muteIndex].label);
+      }
 
       // Protocol 2 is PulseDistance (based on your data)
       // So send using sendPulseDistance function
@@ -114,7 +156,9 @@ void loop() {
         true     // LSB first
       );
 
-      Serial.println("Sent Mute code");
+      if (!binaryMode) {
+        Serial.println("Sent Mute code");
+      }
     }
   }
 }
@@ -0,0 +1,323 @@
+# Reads decoded IR codes from the remote_decoder Arduino over serial and
+# looks them up in the code table.
+#
+#   python serial_reader.py [port] [--learn] [--binary]
+#
+# --learn records codes missing from the table, named "Unknown 0x...", so
+# the labels can be filled in afterwards. --binary switches the firmware to
+# its compact binary reports. Without a code table one is seeded from the
+# buttonCodes table in remote_decoder.ino.
+import asyncio
+import json
+import os
+import re
+import sys
+import termios
+import tty
+from typing import Callable, Optional
+
+# Config
+PORT = "/dev/ttyUSB0"
+BAUD_RATE = 115200
+CODE_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "code_table.json")
+INO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "remote_decoder", "remote_decoder.ino")
+READ_SIZE = 4096
+
+# Text reports look like "Received code: 0x30FCF - Mute"
+TEXT_PREFIX = b"Received code: 0x"
+
+# Binary reports: sync byte, 4 byte big endian code, XOR of the code bytes
+FRAME_SYNC = 0xA5
+FRAME_SIZE = 6
+
+# Firmware commands and the line it answers with before switching
+BINARY_COMMAND = b"B\n"
+TEXT_COMMAND = b"T\n"
+BINARY_ACK = b"Mode binary"
+TEXT_ACK = b"Mode text"
+
+# Printed by setup(), the board has reset (e.g. on port open) and is back in
+# text mode
+READY_BANNER = b"IR Receiver and Sender ready"
+
+# NEC repeat frames decode to 0 while a button is held
+REPEAT_CODE = 0
+
+# A garbage line without a newline shouldn't grow the buffer forever
+MAX_LINE_LENGTH = 256
+
+
+class CodeTable:
+    # Code to button label index, persisted as JSON with hex string keys so
+    # it stays readable and editable by hand
+
+    def __init__(self, codes: Optional[dict[int, str]] = None, path: Optional[str] = None):
+        self.codes: dict[int, str] = dict(codes or {})
+        self.path = path
+
+    @classmethod
+    def load(cls, path: str) -> 'CodeTable':
+        with open(path) as f:
+            data = json.load(f)
+        return cls({int(code, 16): label for code, label in data["codes"].items()}, path)
+
+    @classmethod
+    def from_ino(cls, ino_path: str, path: Optional[str] = None) -> 'CodeTable':
+        # Reads the {0x30FCF, "Mute"} entries of the firmware's buttonCodes
+        with open(ino_path) as f:
+            source = f.read()
+        entries = re.findall(r'\{\s*0x([0-9A-Fa-f]+)\s*,\s*"([^"]*)"\s*\}', source)
+        return cls({int(code, 16): label for code, label in entries}, path)
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        data = {"codes": {f"0x{code:X}": label for code, label in self.codes.items()}}
+
+        # Replace atomically so a crash never leaves a truncated table
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    def lookup(self, code: int) -> Optional[str]:
+        return self.codes.get(code)
+
+    def learn(self, code: int, label: Optional[str] = None) -> str:
+        label = label or f"Unknown 0x{code:X}"
+        self.codes[code] = label
+        if self.path is not None:
+            self.save()
+        return label
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class StreamParser:
+    # Incremental parser for the firmware's serial output. Bytes are
+    # appended to one reusable buffer and scanned in place, only the hex
+    # digits of each code are copied out for int(). Consumed bytes are
+    # dropped once per feed rather than once per report.
+
+    def __init__(self, binary: bool = False):
+        self.binary = binary
+        self.pending_mode: Optional[bool] = None
+        self.restarted = False
+        self.bad_frames = 0
+        self._buffer = bytearray()
+
+    def request_mode(self, binary: bool) -> None:
+        # The firmware acks in text and only then switches, keep parsing in
+        # the old mode until the ack arrives
+        self.pending_mode = binary
+
+    def feed(self, data: bytes) -> list[int]:
+        buffer = self._buffer
+        buffer += data
+        codes = []
+
+        position = 0
+        while True:
+            binary = self.binary
+            if binary:
+                consumed = self._parse_frame(buffer, position, codes)
+            else:
+                consumed = self._parse_line(buffer, position, codes)
+            position += consumed
+            if consumed == 0 and binary == self.binary:
+                break
+
+        del buffer[:position]
+        if not self.binary and len(buffer) > MAX_LINE_LENGTH:
+            buffer.clear()
+        return codes
+
+    def _parse_line(self, buffer: bytearray, start: int, codes: list[int]) -> int:
+        end = buffer.find(b"\n", start)
+        if end < 0:
+            return 0
+
+        if buffer.startswith(TEXT_PREFIX, start):
+            digits_start = start + len(TEXT_PREFIX)
+            digits_end = digits_start
+            while digits_end < end and buffer[digits_end] in b"0123456789ABCDEFabcdef":
+                digits_end += 1
+            if digits_end > digits_start:
+                codes.append(int(buffer[digits_start:digits_end], 16))
+        elif self.pending_mode is not None and \
+                buffer.startswith(BINARY_ACK if self.pending_mode else TEXT_ACK, start):
+            self.binary = self.pending_mode
+            self.pending_mode = None
+        elif buffer.startswith(READY_BANNER, start):
+            self.restarted = True
+
+        return end + 1 - start
+
+    def _parse_frame(self, buffer: bytearray, start: int, codes: list[int]) -> int:
+        sync = buffer.find(FRAME_SYNC, start)
+
+        # Text never contains the sync byte, so text before the next frame
+        # is either the ack for switching back or a reset banner
+        text_end = len(buffer) if sync < 0 else sync
+        for marker in (TEXT_ACK, READY_BANNER):
+            found = buffer.find(marker, start, text_end)
+            if found >= 0 and (marker != TEXT_ACK or self.pending_mode is False):
+                self.binary = False
+                self.pending_mode = None
+                return found - start
+
+        if sync < 0:
+            # Noise, but keep enough to still match a marker cut in half
+            return max(0, len(buffer) - start - len(READY_BANNER) + 1)
+        if sync > start:
+            return sync - start
+        if len(buffer) - start < FRAME_SIZE:
+            return 0
+
+        b1, b2, b3, b4, checksum = buffer[start + 1:start + FRAME_SIZE]
+        if b1 ^ b2 ^ b3 ^ b4 != checksum:
+            # A sync byte inside a frame, resync from the next byte
+            self.bad_frames += 1
+            return 1
+
+        codes.append((b1 << 24) | (b2 << 16) | (b3 << 8) | b4)
+        return FRAME_SIZE
+
+
+def open_serial(port: str, baud_rate: int = BAUD_RATE) -> int:
+    # Raw, non blocking 8N1 file descriptor for use with loop.add_reader
+    fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        # Raw mode, also flushing codes that queued up before we opened
+        tty.setraw(fd)
+        attributes = termios.tcgetattr(fd)
+        speed = getattr(termios, f"B{baud_rate}")
+        attributes[4] = attributes[5] = speed
+        attributes[2] |= termios.CLOCAL | termios.CREAD
+        termios.tcsetattr(fd, termios.TCSANOW, attributes)
+    except Exception:
+        os.close(fd)
+        raise
+    return fd
+
+
+class SerialReader:
+    # Reads the serial port on the asyncio loop via add_reader, no threads.
+    # Every non repeat code is passed to `on_code(code, label)`, where label
+    # is None for codes missing from the table (unless learning).
+
+    def __init__(self,
+                 port: str,
+                 table: CodeTable,
+                 on_code: Callable[[int, Optional[str]], None],
+                 baud_rate: int = BAUD_RATE,
+                 learn: bool = False,
+                 binary: bool = False):
+        self.port = port
+        self.table = table
+        self.on_code = on_code
+        self.baud_rate = baud_rate
+        self.learn = learn
+        self.binary = binary
+        self.parser = StreamParser()
+        self.received = 0
+        self.learned = 0
+        self._fd: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed: Optional[asyncio.Future] = None
+
+    def open(self) -> 'SerialReader':
+        self._loop = asyncio.get_running_loop()
+        self._fd = open_serial(self.port, self.baud_rate)
+        self.closed = self._loop.create_future()
+        self._loop.add_reader(self._fd, self._on_readable)
+        if self.binary:
+            self.set_binary(True)
+        return self
+
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+    async def __aenter__(self):
+        return self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def set_binary(self, binary: bool) -> None:
+        self.parser.request_mode(binary)
+        os.write(self._fd, BINARY_COMMAND if binary else TEXT_COMMAND)
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            # Unplugged
+            self.close()
+            return
+        if not data:
+            self.close()
+            return
+
+        codes = self.parser.feed(data)
+        if self.parser.restarted:
+            # Commands sent while the bootloader ran were lost, ask again
+            self.parser.restarted = False
+            if self.binary:
+                self.set_binary(True)
+
+        for code in codes:
+            if code == REPEAT_CODE:
+                continue
+            self.received += 1
+
+            label = self.table.lookup(code)
+            if label is None and self.learn:
+                label = self.table.learn(code)
+                self.learned += 1
+            self.on_code(code, label)
+
+
+def load_table(path: str = CODE_TABLE_PATH) -> CodeTable:
+    if os.path.exists(path):
+        return CodeTable.load(path)
+    table = CodeTable.from_ino(INO_PATH, path)
+    table.save()
+    print(f"Seeded {path} with {len(table)} codes from {INO_PATH}")
+    return table
+
+
+async def run(port: str, learn: bool, binary: bool) -> None:
+    table = load_table()
+
+    def on_code(code: int, label: Optional[str]) -> None:
+        print(f"0x{code:X} - {label or 'Unknown'}")
+
+    async with SerialReader(port, table, on_code, learn=learn, binary=binary) as reader:
+        print(f"Reading {port} ({'binary' if binary else 'text'}, {len(table)} known codes)")
+        await reader.closed
+
+    print(f"Port closed after {reader.received} codes, learned {reader.learned}")
+
+
+def main(argv):
+    flags = {arg for arg in argv if arg.startswith("--")}
+    args = [arg for arg in argv if not arg.startswith("--")]
+    port = args[0] if args else PORT
+    try:
+        asyncio.run(run(port, "--learn" in flags, "--binary" in flags))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
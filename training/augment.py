@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), ".."))
+
+from gesture_runtime.features import FEATURE_NAMES  # noqa: E402
+from gesture_runtime.synthetic import SyntheticLandmarks  # noqa: E402
+
+# Config
+CSV_PATH = "hand_landmarks.csv"
+OUTPUT_PATH = "hand_landmarks_augmented.csv"
+
+# Synthetic rows added per class, on top of the original rows
+SAMPLES_PER_CLASS = 2000
+SEED = 42
+
+
+def main():
+    df = pd.read_csv(CSV_PATH)
+    generator = SyntheticLandmarks.from_csv(CSV_PATH, seed=SEED)
+
+    X, y = generator.generate(SAMPLES_PER_CLASS * len(generator.classes))
+    synthetic = pd.DataFrame(X, columns=FEATURE_NAMES)
+    synthetic["label"] = y
+
+    augmented = pd.concat([df, synthetic], ignore_index=True)
+    augmented.to_csv(OUTPUT_PATH, index=False)
+
+    print(f"{'label':<14}{'original':>10}{'augmented':>11}")
+    before = df["label"].value_counts().sort_index()
+    after = augmented["label"].value_counts().sort_index()
+    for label in after.index:
+        print(f"{label:<14}{int(before.get(label, 0)):>10}{int(after[label]):>11}")
+    print(f"Saved {len(augmented)} rows ({len(synthetic)} synthetic) to {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    if not os.path.exists(CSV_PATH):
+        raise SystemExit(f"Dataset not found: {CSV_PATH}")
+    main()
@@ -1,11 +1,16 @@
 import cv2
-import mediapipe as mp
 import csv
 import os
+import sys
 import pyautogui
-import numpy as np
 
-from utils import resize_with_aspect_ratio
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), ".."))
+
+from gesture_runtime.features import FEATURE_NAMES, FeatureExtractor  # noqa: E402
+from gesture_runtime.frame_source import FrameSource  # noqa: E402
+from gesture_runtime.landmarks import LandmarkProvider, draw_landmarks  # noqa: E402
+from gesture_runtime.preprocessing import Letterbox, Preprocessor  # noqa: E402
 
 # Config
 LABEL = ""
@@ -25,8 +30,7 @@ KEY_LABEL_MAP = {
     ord("7"): "thumbs_down"
 }
 
-HEADER = [f"{axis}{i}" for i in range(21)
-          for axis in ['x', 'y', 'z']] + ["label"]
+HEADER = FEATURE_NAMES + ["label"]
 
 
 def collect_timed_samples(count, label):
@@ -35,20 +39,18 @@ def collect_timed_samples(count, label):
     samples_captured = 0
 
     while samples_captured < count:
-        ret, frame = cap.read()
-        if not ret:
+        frame = frame_source.read()
+        if frame is None:
             continue
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
+        frame = preprocessor.mirror(frame)
+        result = hands.process(preprocessor.to_detection(frame))
 
         if result.multi_hand_landmarks:
             hand_landmarks = result.multi_hand_landmarks[0]
 
             # Draw landmarks and bounding box
-            mp_drawing.draw_landmarks(
-                frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            draw_landmarks(frame, hand_landmarks)
             h, w, _ = frame.shape
             xs = [lm.x * w for lm in hand_landmarks.landmark]
             ys = [lm.y * h for lm in hand_landmarks.landmark]
@@ -64,9 +66,7 @@ def collect_timed_samples(count, label):
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
             # Save landmarks
-            row = []
-            for lm in hand_landmarks.landmark:
-                row.extend([lm.x, lm.y, lm.z])
+            row = features.extract(hand_landmarks)[0].tolist()
             row.append(label)
             csv_writer.writerow(row)
 
@@ -85,7 +85,7 @@ def collect_timed_samples(count, label):
             samples_captured += 1
 
         # Display frame
-        display_frame = resize_with_aspect_ratio(frame, *pyautogui.size())
+        display_frame = letterbox(frame)
         cv2.imshow("Capture", display_frame)
 
         # Wait until 1s from last sample
@@ -94,10 +94,10 @@ def collect_timed_samples(count, label):
 
 
 # Setup MediaPipe
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False,
-                       max_num_hands=1, min_detection_confidence=0.5)
-mp_drawing = mp.solutions.drawing_utils
+hands = LandmarkProvider(max_num_hands=1, min_detection_confidence=0.5).open()
+features = FeatureExtractor()
+preprocessor = Preprocessor()
+letterbox = Letterbox(*pyautogui.size())
 
 # CSV setup
 file_exists = os.path.exists(CSV_PATH)
@@ -107,25 +107,23 @@ if not file_exists:
     csv_writer.writerow(HEADER)
 
 # Webcam setup
-cap = cv2.VideoCapture(0)
+frame_source = FrameSource(0).open()
 print("Press number key [0–9] to set label, 's' to save, 'q' to quit.")
 
 image_count = 0
 
 try:
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
+    while frame_source.is_opened():
+        frame = frame_source.read()
+        if frame is None:
             break
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
+        frame = preprocessor.mirror(frame)
+        result = hands.process(preprocessor.to_detection(frame))
 
         if result.multi_hand_landmarks:
             hand_landmarks = result.multi_hand_landmarks[0]
-            mp_drawing.draw_landmarks(
-                frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            draw_landmarks(frame, hand_landmarks)
 
             # Compute bounding box from landmarks
             h, w, _ = frame.shape
@@ -143,9 +141,7 @@ try:
         cv2.putText(frame, f"Label: {LABEL}", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
-        screen_width, screen_height = pyautogui.size()
-        display_frame = resize_with_aspect_ratio(
-            frame, screen_width, screen_height)
+        display_frame = letterbox(frame)
 
         cv2.imshow("Capture", display_frame)
 
@@ -161,9 +157,7 @@ try:
 
         elif key == ord("s") and result.multi_hand_landmarks and LABEL:
             # Save landmarks
-            row = []
-            for lm in hand_landmarks.landmark:
-                row.extend([lm.x, lm.y, lm.z])
+            row = features.extract(hand_landmarks)[0].tolist()
             row.append(LABEL)
             csv_writer.writerow(row)
 
@@ -183,7 +177,7 @@ try:
             break
 
 finally:
-    cap.release()
+    frame_source.close()
     csv_file.close()
     cv2.destroyAllWindows()
     hands.close()
@@ -0,0 +1,161 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KDTree
+
+# Config
+CSV_PATH = "hand_landmarks.csv"
+OUTPUT_PATH = "hand_landmarks_dedup.csv"
+
+# Samples of the same label closer than this (euclidean distance over the
+# 63 landmark values) are treated as near duplicates. MediaPipe landmarks are
+# already normalised to the frame, so 0.02 is roughly "the hand moved less than
+# 2% of the frame in total across all joints".
+DUPLICATE_RADIUS = 0.02
+
+# Train a model on both the original and the pruned dataset and report the
+# difference in training time, model size and accuracy
+COMPARE_MODELS = True
+
+# The comparison holds out whole blocks of consecutive rows. Neighbouring
+# frames are near copies of each other, so a random row split would leave a
+# near copy of almost every test row in the training set and hide any loss
+# from pruning. A block is a run of one label (one capture session) cut
+# into at most this many rows, about 3 seconds of capture at 30 fps.
+TEST_BLOCK_ROWS = 100
+TEST_FRACTION = 0.2
+
+
+def class_balance(df: pd.DataFrame) -> pd.Series:
+    return df["label"].value_counts().sort_index()
+
+
+def prune_label(features: np.ndarray, radius: float) -> np.ndarray:
+    # Returns the row indices to keep. Rows are visited in capture order and a
+    # row is kept only if no previously kept row lies within `radius`.
+    if len(features) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    tree = KDTree(features)
+    neighbours = tree.query_radius(features, r=radius)
+
+    removed = np.zeros(len(features), dtype=bool)
+    keep = []
+    for i, near in enumerate(neighbours):
+        if removed[i]:
+            continue
+        keep.append(i)
+        removed[near] = True
+
+    return np.asarray(keep, dtype=np.intp)
+
+
+def deduplicate(df: pd.DataFrame, radius: float) -> pd.DataFrame:
+    # Exact duplicates are cheap to drop up front and shrink the KD-trees
+    df = df.drop_duplicates()
+
+    feature_columns = [c for c in df.columns if c != "label"]
+    kept = []
+
+    # Index each label separately, near duplicates across labels are
+    # conflicting samples rather than redundant ones
+    for _, group in df.groupby("label", sort=False):
+        features = group[feature_columns].to_numpy(dtype=np.float64)
+        keep = prune_label(features, radius)
+        kept.append(group.iloc[keep])
+
+    # Restore the original row order so the output is still append ordered
+    return pd.concat(kept).sort_index()
+
+
+def print_balance(before: pd.Series, after: pd.Series) -> None:
+    print(f"{'label':<14}{'before':>8}{'after':>8}{'removed':>9}")
+    for label in before.index:
+        b = int(before[label])
+        a = int(after.get(label, 0))
+        removed = 100.0 * (b - a) / b if b else 0.0
+        print(f"{label:<14}{b:>8}{a:>8}{removed:>8.1f}%")
+    print(f"{'total':<14}{int(before.sum()):>8}{int(after.sum()):>8}")
+
+
+def fit_and_measure(X_train, y_train, X_test, y_test):
+    clf = RandomForestClassifier(n_estimators=100, random_state=42)
+
+    start = time.perf_counter()
+    clf.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    size = len(pickle.dumps(clf))
+    accuracy = clf.score(X_test, y_test)
+    return fit_time, size, accuracy
+
+
+def capture_blocks(df: pd.DataFrame, block_rows: int = TEST_BLOCK_ROWS) -> pd.Series:
+    # Block number per row: a new block starts whenever the label changes or
+    # the current run reaches `block_rows`
+    labels = df["label"]
+    run = (labels != labels.shift()).cumsum()
+    position = labels.groupby(run).cumcount()
+    return run.astype(str) + ":" + (position // block_rows).astype(str)
+
+
+def block_split(df: pd.DataFrame, test_fraction: float = TEST_FRACTION,
+                seed: int = 42) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Holds out about `test_fraction` of each label's blocks, and at least one
+    # block per label while it has more than one
+    rng = np.random.default_rng(seed)
+    blocks = capture_blocks(df)
+    test_blocks = set()
+    for _, label_blocks in blocks.groupby(df["label"], sort=False):
+        names = label_blocks.unique()
+        count = min(max(1, round(len(names) * test_fraction)), len(names) - 1)
+        test_blocks.update(rng.choice(names, size=count, replace=False))
+
+    is_test = blocks.isin(test_blocks)
+    return df[~is_test], df[is_test]
+
+
+def compare_models(original: pd.DataFrame, pruned: pd.DataFrame) -> None:
+    # Hold out whole capture blocks from the original data and evaluate both
+    # models against them, so the pruned model is measured on the same
+    # samples and neither has seen near copies of them
+    train, test = block_split(original)
+    pruned_train = pruned.loc[pruned.index.isin(train.index)]
+
+    X_test = test.drop("label", axis=1)
+    y_test = test["label"]
+
+    results = {
+        "original": fit_and_measure(train.drop("label", axis=1), train["label"], X_test, y_test),
+        "pruned": fit_and_measure(pruned_train.drop("label", axis=1), pruned_train["label"], X_test, y_test),
+    }
+
+    print(f"{'dataset':<10}{'rows':>8}{'fit (s)':>10}{'size (KB)':>12}{'accuracy':>10}")
+    for name, rows in (("original", len(train)), ("pruned", len(pruned_train))):
+        fit_time, size, accuracy = results[name]
+        print(f"{name:<10}{rows:>8}{fit_time:>10.2f}{size / 1024:>12.0f}{accuracy:>10.4f}")
+
+
+def main():
+    df = pd.read_csv(CSV_PATH)
+    pruned = deduplicate(df, DUPLICATE_RADIUS)
+
+    print(f"Near duplicate radius: {DUPLICATE_RADIUS}")
+    print_balance(class_balance(df), class_balance(pruned))
+
+    pruned.to_csv(OUTPUT_PATH, index=False)
+    print(f"Saved {len(pruned)} of {len(df)} rows to {OUTPUT_PATH}")
+
+    if COMPARE_MODELS:
+        print()
+        compare_models(df, pruned)
+
+
+if __name__ == "__main__":
+    if not os.path.exists(CSV_PATH):
+        raise SystemExit(f"Dataset not found: {CSV_PATH}")
+    main()
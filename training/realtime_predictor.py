@@ -1,62 +1,66 @@
+import os
+import sys
 import cv2
-import mediapipe as mp
-import joblib
-import numpy as np
 import pyautogui
 
-from utils import resize_with_aspect_ratio
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), ".."))
+
+from gesture_runtime.classifier import GestureClassifier  # noqa: E402
+from gesture_runtime.features import FeatureExtractor  # noqa: E402
+from gesture_runtime.frame_source import FrameSource  # noqa: E402
+from gesture_runtime.landmarks import LandmarkProvider, draw_landmarks  # noqa: E402
+from gesture_runtime.preprocessing import Letterbox, Preprocessor  # noqa: E402
+
+# Use "gesture_model_q16.npz" (training.py --quantize) on low power boxes
+MODEL_PATH = "gesture_model.pkl"
 
 # Load model
-model = joblib.load("gesture_model.pkl")
+classifier = GestureClassifier.from_path(MODEL_PATH)
+features = FeatureExtractor()
 
 # Setup MediaPipe
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False,
-                       max_num_hands=2)  # Detect up to 2 hands
-mp_drawing = mp.solutions.drawing_utils
+hands = LandmarkProvider(max_num_hands=2).open()  # Detect up to 2 hands
+preprocessor = Preprocessor()
+letterbox = Letterbox(*pyautogui.size())
 
 # Webcam
-cap = cv2.VideoCapture(0)
+frame_source = FrameSource(0).open()
 print("Running real-time prediction (2 hands). Press 'q' to quit.")
 
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
+while frame_source.is_opened():
+    frame = frame_source.read()
+    if frame is None:
         break
 
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(rgb)
+    frame = preprocessor.mirror(frame)
+    result = hands.process(preprocessor.to_detection(frame))
 
-    display_frame = resize_with_aspect_ratio(frame, *pyautogui.size())
+    display_frame = letterbox(frame)
 
     if result.multi_hand_landmarks and result.multi_handedness:
         for idx, hand_landmarks in enumerate(result.multi_hand_landmarks):
             # Draw landmarks
-            mp_drawing.draw_landmarks(
-                display_frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            draw_landmarks(display_frame, hand_landmarks)
 
             # Extract features (21 landmarks * 3 values)
-            data = []
-            for lm in hand_landmarks.landmark:
-                data.extend([lm.x, lm.y, lm.z])
-
-            if len(data) == 63:
-                prediction = model.predict([data])[0]
-                # "Left" or "Right"
-                hand_label = result.multi_handedness[idx].classification[0].label
-
-                # Display label near wrist landmark
-                wrist = hand_landmarks.landmark[0]
-                h, w, _ = display_frame.shape
-                cx, cy = int(wrist.x * w), int(wrist.y * h)
-                cv2.putText(display_frame, f"{hand_label}: {prediction}", (cx, cy - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            prediction, _ = classifier.predict(
+                features.extract(hand_landmarks))
+
+            # "Left" or "Right"
+            hand_label = result.multi_handedness[idx].classification[0].label
+
+            # Display label near wrist landmark
+            wrist = hand_landmarks.landmark[0]
+            h, w, _ = display_frame.shape
+            cx, cy = int(wrist.x * w), int(wrist.y * h)
+            cv2.putText(display_frame, f"{hand_label}: {prediction}", (cx, cy - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
 
     cv2.imshow("Prediction", display_frame)
     if cv2.waitKey(1) & 0xFF == ord("q"):
         break
 
-cap.release()
+frame_source.close()
 cv2.destroyAllWindows()
 hands.close()
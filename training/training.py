@@ -1,30 +1,280 @@
 # train_classifier.py
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 
-# Load dataset
-df = pd.read_csv("hand_landmarks.csv")
-X = df.drop("label", axis=1)
-y = df["label"]
-
-# Split into train/test
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42)
-
-# Train classifier
-clf = RandomForestClassifier(n_estimators=100, random_state=42)
-clf.fit(X_train, y_train)
-
-# Evaluate
-y_pred = clf.predict(X_test)
-print("Classification Report:")
-print(classification_report(y_test, y_pred))
-print("Confusion Matrix:")
-print(confusion_matrix(y_test, y_pred))
-
-# Save model
-joblib.dump(clf, "gesture_model.pkl")
-print("Model saved to gesture_model.pkl")
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), ".."))
+from gesture_runtime.quantized_forest import QuantizedForest  # noqa: E402
+
+# Config
+CSV_PATH = "hand_landmarks.csv"
+MODEL_PATH = "gesture_model.pkl"
+MODEL_META_PATH = "gesture_model.json"
+MODEL_VERSIONS_DIR = "models"
+
+N_ESTIMATORS = 100
+
+# Incremental mode fits extra trees on the rows appended to the CSV since the
+# last training run and adds them to the existing forest (warm_start). The
+# trained rows are fingerprinted, a CSV rewritten since (e.g. replaced by the
+# dedupe.py output) gets a full fit instead. Incremental fits are scored on
+# the test split of the last full fit and train on every new row.
+INCREMENTAL = "--incremental" in sys.argv[1:]
+INCREMENTAL_ESTIMATORS = 20
+
+# Fraction of previously trained rows (per label) mixed into an incremental
+# fit, so the new trees still see every class the forest already knows
+REPLAY_FRACTION = 0.1
+
+# Also export an int16 quantized copy of the model for low power boxes
+EXPORT_QUANTIZED = "--quantize" in sys.argv[1:]
+QUANTIZED_MODEL_PATH = "gesture_model_q16.npz"
+BENCHMARK_RUNS = 200
+
+
+def load_meta():
+    if not os.path.exists(MODEL_META_PATH) or not os.path.exists(MODEL_PATH):
+        return None
+    with open(MODEL_META_PATH) as f:
+        return json.load(f)
+
+
+def fingerprint(df, rows):
+    # Hash of the first `rows` rows, to tell appended from rewritten data
+    hashes = pd.util.hash_pandas_object(df.iloc[:rows], index=False)
+    return hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest()
+
+
+def holdout_split(df, rows):
+    # The full fit's train/test split of the first `rows` rows, reproducible
+    # as long as those rows are unchanged
+    return train_test_split(df.iloc[:rows], test_size=0.2, random_state=42)
+
+
+def split(df):
+    X = df.drop("label", axis=1)
+    y = df["label"]
+    return X, y
+
+
+def replay_sample(df, fraction):
+    samples = []
+    for _, group in df.groupby("label"):
+        n = max(1, int(len(group) * fraction))
+        samples.append(group.sample(n=n, random_state=42))
+    return pd.concat(samples)
+
+
+def train_full(df):
+    # Split into train/test
+    train, test = holdout_split(df, len(df))
+    X_train, y_train = split(train)
+    X_test, y_test = split(test)
+
+    # Train classifier
+    clf = RandomForestClassifier(n_estimators=N_ESTIMATORS, random_state=42)
+    clf.fit(X_train, y_train)
+
+    return clf, X_test, y_test
+
+
+def train_incremental(df, clf, trained_rows, holdout_rows):
+    new_rows = df.iloc[trained_rows:]
+
+    # Rows the forest was trained on so far, without the held out ones
+    holdout_train, holdout_test = holdout_split(df, holdout_rows)
+    old_rows = pd.concat([holdout_train, df.iloc[holdout_rows:trained_rows]])
+
+    # Old trees index classes by position in classes_, so the new trees must
+    # be fitted on exactly the same label set
+    fit_rows = pd.concat([new_rows, replay_sample(old_rows, REPLAY_FRACTION)])
+    X_fit, y_fit = split(fit_rows)
+
+    clf.set_params(warm_start=True,
+                   n_estimators=len(clf.estimators_) + INCREMENTAL_ESTIMATORS)
+    clf.fit(X_fit, y_fit)
+    clf.set_params(warm_start=False)
+
+    X_test, y_test = split(holdout_test)
+    return clf, X_test, y_test
+
+
+# Outcomes of plan_incremental
+PLAN_SKIP = "skip"
+PLAN_FULL = "full"
+PLAN_INCREMENTAL = "incremental"
+
+
+def plan_incremental(df, clf, trained_rows):
+    # Too few new rows to train on is a skip, not a reason for a full fit
+    new_rows = df.iloc[trained_rows:]
+    old_rows = df.iloc[:trained_rows]
+
+    if len(new_rows) < 5:
+        print(f"Only {len(new_rows)} new rows, nothing to train")
+        return PLAN_SKIP
+
+    new_labels = set(new_rows["label"]) - set(clf.classes_)
+    if new_labels:
+        print(f"New labels {sorted(new_labels)}, retraining from scratch")
+        return PLAN_FULL
+
+    missing_labels = set(clf.classes_) - set(old_rows["label"])
+    if missing_labels:
+        print(f"Labels {sorted(missing_labels)} missing from the dataset, retraining from scratch")
+        return PLAN_FULL
+
+    return PLAN_INCREMENTAL
+
+
+def save_model(clf, meta):
+    # Keep every version, then publish the new one over MODEL_PATH with an
+    # atomic rename so a running HandProcessor never sees a partial file
+    os.makedirs(MODEL_VERSIONS_DIR, exist_ok=True)
+    versioned_path = os.path.join(
+        MODEL_VERSIONS_DIR, f"gesture_model_v{meta['version']:04}.pkl")
+    joblib.dump(clf, versioned_path)
+
+    tmp_path = MODEL_PATH + ".tmp"
+    joblib.dump(clf, tmp_path)
+    os.replace(tmp_path, MODEL_PATH)
+
+    with open(MODEL_META_PATH, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    return versioned_path
+
+
+def export_quantized(clf):
+    quantized = QuantizedForest.from_forest(clf)
+
+    tmp_path = QUANTIZED_MODEL_PATH + ".tmp.npz"
+    quantized.save(tmp_path)
+    os.replace(tmp_path, QUANTIZED_MODEL_PATH)
+
+    return QuantizedForest.load(QUANTIZED_MODEL_PATH)
+
+
+def measure_load(load, path):
+    tracemalloc.start()
+    model = load(path)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return model, memory
+
+
+def measure_latency(model, rows):
+    # Single sample predictions, the way HandProcessor calls the model
+    times = []
+    for i in range(BENCHMARK_RUNS):
+        data = [rows[i % len(rows)].tolist()]
+        start = time.perf_counter()
+        model.predict_proba(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), max(times)
+
+
+def quantized_report(X_test, y_test):
+    float_model, float_memory = measure_load(joblib.load, MODEL_PATH)
+    quantized, quantized_memory = measure_load(
+        QuantizedForest.load, QUANTIZED_MODEL_PATH)
+
+    rows = X_test.to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        # Both models are fed plain arrays, like in HandProcessor
+        warnings.simplefilter("ignore", UserWarning)
+        float_proba = float_model.predict_proba(rows)
+        float_latency = measure_latency(float_model, rows)
+    quantized_proba = quantized.predict_proba(rows)
+    quantized_latency = measure_latency(quantized, rows)
+
+    float_pred = float_model.classes_[np.argmax(float_proba, axis=1)]
+    quantized_pred = quantized.classes_[np.argmax(quantized_proba, axis=1)]
+
+    print("Quantized Model Report:")
+    print(f"prediction agreement: {np.mean(float_pred == quantized_pred):.4f}")
+    print(f"max probability error: {np.max(np.abs(float_proba - quantized_proba)):.4f}")
+    print(f"{'model':<10}{'accuracy':>10}{'file (KB)':>12}{'memory (KB)':>14}{'median (ms)':>14}{'max (ms)':>10}")
+    for name, path, pred, memory, latency in (
+            ("float", MODEL_PATH, float_pred, float_memory, float_latency),
+            ("int16", QUANTIZED_MODEL_PATH, quantized_pred, quantized_memory, quantized_latency)):
+        print(f"{name:<10}{np.mean(pred == y_test.to_numpy()):>10.4f}"
+              f"{os.path.getsize(path) / 1024:>12.0f}{memory / 1024:>14.0f}"
+              f"{latency[0] * 1000:>14.3f}{latency[1] * 1000:>10.3f}")
+
+
+def main():
+    # Load dataset
+    df = pd.read_csv(CSV_PATH)
+    meta = load_meta()
+
+    start = time.perf_counter()
+    clf = None
+    holdout_rows = len(df)
+
+    if INCREMENTAL and meta is not None:
+        trained_rows = meta["trained_rows"]
+        if trained_rows > len(df) or "trained_hash" not in meta or \
+                fingerprint(df, trained_rows) != meta["trained_hash"]:
+            print(f"{CSV_PATH} was rewritten since the last training run, retraining from scratch")
+        elif trained_rows == len(df):
+            print("No new rows since the last training run")
+            return
+        else:
+            clf = joblib.load(MODEL_PATH)
+            plan = plan_incremental(df, clf, trained_rows)
+            if plan == PLAN_SKIP:
+                return
+            if plan == PLAN_INCREMENTAL:
+                print(f"Incremental fit on {len(df) - trained_rows} new rows")
+                holdout_rows = meta["holdout_rows"]
+                clf, X_test, y_test = train_incremental(
+                    df, clf, trained_rows, holdout_rows)
+            else:
+                clf = None
+
+    if clf is None:
+        print(f"Full fit on {len(df)} rows")
+        clf, X_test, y_test = train_full(df)
+
+    print(f"Trained {len(clf.estimators_)} trees in {time.perf_counter() - start:.2f}s")
+
+    # Evaluate
+    y_pred = clf.predict(X_test)
+    print("Classification Report:")
+    print(classification_report(y_test, y_pred))
+    print("Confusion Matrix:")
+    print(confusion_matrix(y_test, y_pred))
+
+    # Save model
+    version = meta["version"] + 1 if meta is not None else 1
+    versioned_path = save_model(clf, {
+        "version": version,
+        "trained_rows": len(df),
+        "trained_hash": fingerprint(df, len(df)),
+        "holdout_rows": holdout_rows,
+        "n_estimators": len(clf.estimators_),
+        "classes": [str(c) for c in clf.classes_],
+    })
+    print(f"Model saved to {MODEL_PATH} ({versioned_path})")
+
+    if EXPORT_QUANTIZED:
+        export_quantized(clf)
+        print(f"Quantized model saved to {QUANTIZED_MODEL_PATH}")
+        quantized_report(X_test, y_test)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +0,0 @@
-import cv2
-import numpy as np
-
-
-def resize_with_aspect_ratio(image, target_width, target_height):
-    h, w = image.shape[:2]
-    scale = min(target_width / w, target_height / h)
-    new_w = int(w * scale)
-    new_h = int(h * scale)
-    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-    result = np.zeros((target_height, target_width, 3), dtype=np.uint8)
-    x_offset = (target_width - new_w) // 2
-    y_offset = (target_height - new_h) // 2
-    result[y_offset:y_offset+new_h, x_offset:x_offset+new_w] = resized
-    return result